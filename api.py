@@ -1,9 +1,17 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
+from loguru import logger
 import threading
 
+from config import settings
+
 app = FastAPI(title="Sai Baba Guidance Chatbot")
+if settings.gzip_minimum_size > 0:
+    app.add_middleware(
+        GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_compress_level
+    )
 
 rag_engine = None
 rag_lock = threading.Lock()
@@ -26,7 +34,7 @@ class AnswerResponse(BaseModel):
 
 
 @app.get("/")
-def root():
+def root() -> Dict[str, Any]:
     return {
         "message": "Welcome to Sai Baba Guidance Chatbot",
         "endpoints": {
@@ -43,7 +51,7 @@ def root():
 
 
 @app.get("/health")
-def health():
+def health() -> Dict[str, Any]:
     return {"status": "ok"}
 
 
@@ -61,6 +69,7 @@ def ask(req: QuestionRequest):
     try:
         result = rag_engine.answer_question(req.question)
         # FastAPI will validate/serialize the response according to AnswerResponse
-        return result
+        return result.to_dict()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Failed to answer question: {e}")
+        raise HTTPException(status_code=500, detail="Failed to answer the question")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Serve one of the chatbot APIs with uvicorn.
+
+Usage:
+    python api_entrypoint.py                  # simple_api (engine chosen by USE_LLM)
+    python api_entrypoint.py retrieval_api    # retrieval-only API
+
+The app is handed to uvicorn as an import string, so this process never
+imports it itself and each worker loads it exactly once.
+"""
+
+import importlib.util
+import os
+import sys
+from typing import Any, Optional
+
+from config import settings
+
+
+def run(app_path: str, host: str, port: int, app: Optional[Any] = None) -> None:
+    """
+    Run uvicorn with uvloop/httptools when available.
+
+    Args:
+        app_path: "module:attribute" import string of the ASGI app
+        host: Interface to bind
+        port: Port to bind
+        app: Already-imported app object; used instead of the import string
+            with a single worker so a script's __main__ module is not
+            imported a second time under its module name
+    """
+    import uvicorn
+
+    # uvloop/httptools ship with uvicorn[standard] (uvloop not on Windows)
+    uvicorn.run(
+        app if app is not None and settings.api_workers <= 1 else app_path,
+        host=host,
+        port=port,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        http="httptools" if importlib.util.find_spec("httptools") else "auto",
+        workers=settings.api_workers,
+        access_log=settings.api_access_log,
+    )
+
+
+if __name__ == "__main__":
+    module = sys.argv[1] if len(sys.argv) > 1 else "simple_api"
+    run(f"{module}:app", settings.api_host, int(os.environ.get("PORT", settings.api_port)))
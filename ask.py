@@ -16,6 +16,9 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import List
 from loguru import logger
 
@@ -31,6 +34,8 @@ except Exception:
 
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+# Answers kept per (normalized question, language); 0 disables the cache
+SIMPLE_ANSWER_CACHE_SIZE = int(os.getenv("SIMPLE_ANSWER_CACHE_SIZE", "2048"))
 
 
 def build_prompt(question: str, passages: List[str]) -> str:
@@ -63,7 +68,8 @@ class SimpleChatbot:
 
     This implementation retrieves passages from the FAISS vector store and returns
     a concatenated answer and source list. If the DB is missing, it returns the
-    required guidance message.
+    required guidance message. Successful answers are kept in a small LRU keyed
+    by the whitespace-normalized, lowercased question and the language.
     """
 
     def __init__(self):
@@ -74,8 +80,31 @@ class SimpleChatbot:
                 self.vector = self.pipeline.load_vector_store()
             except Exception:
                 self.vector = None
+        self._cache: "OrderedDict[tuple, MappingProxyType]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def ask(self, question: str, language: str = "en"):
+        if self.vector is None or SIMPLE_ANSWER_CACHE_SIZE <= 0:
+            return self._answer(question, language)
+
+        key = (" ".join(question.split()).lower(), language or "en")
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is None:
+            result = self._answer(question, language)
+            if not result["is_safe"]:
+                return result
+            cached = MappingProxyType({**result, "sources": tuple(result["sources"])})
+            with self._cache_lock:
+                self._cache[key] = cached
+                while len(self._cache) > SIMPLE_ANSWER_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        # Callers may edit the result, so hand out fresh containers
+        return {**cached, "sources": [dict(s) for s in cached["sources"]]}
+
+    def _answer(self, question: str, language: str = "en"):
         if self.vector is None:
             return {
                 "answer": "Knowledge base not built. Please run python ingest.py --rebuild",
@@ -0,0 +1,168 @@
+"""
+Persistent query cache for the retrieval API.
+
+Stores query embeddings (and the FAISS row ids they retrieved) in SQLite,
+keyed by SHA-256 of the embedding model name and the question, so repeated
+questions skip the sentence-transformer forward pass across restarts.
+A small in-process LRU sits in front of the database.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+
+class QueryCache:
+    """SQLite-backed cache of query embeddings and search hits."""
+
+    def __init__(self, path: str, model_name: str, memory_size: int = 1024):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            model_name: Embedding model name; part of every key, so switching
+                models never serves stale vectors
+            memory_size: Entries kept in the in-process LRU
+        """
+        self.model_name = model_name
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, embedding BLOB NOT NULL, updated_ts INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hits ("
+            "key BLOB NOT NULL, k INTEGER NOT NULL, index_version TEXT NOT NULL, "
+            "ids BLOB NOT NULL, updated_ts INTEGER NOT NULL, "
+            "PRIMARY KEY (key, k, index_version))"
+        )
+        self._conn.commit()
+
+    def key(self, text: str) -> bytes:
+        """SHA-256 of the model name and the question."""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def get_or_embed_many(self, texts: Sequence[str], embed_many: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Return embeddings for several questions, embedding all misses in one call.
+
+        Args:
+            texts: Question texts
+            embed_many: Function embedding a list of texts into an (n, d) array
+
+        Returns:
+            (n, d) float32 embeddings aligned with ``texts``
+        """
+        keys = [self.key(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [self._get(key) for key in keys]
+
+        missing = [i for i, vec in enumerate(vectors) if vec is None]
+        if missing:
+            embedded = np.asarray(embed_many([texts[i] for i in missing]), dtype=np.float32)
+            for row, i in enumerate(missing):
+                vectors[i] = embedded[row]
+            self._put_many([(keys[i], vectors[i]) for i in missing])
+
+        return np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+
+    def get_hits(self, text: str, k: int, index_version: str) -> Optional[List[int]]:
+        """
+        Return the FAISS row ids previously retrieved for a question.
+
+        Args:
+            text: Question text
+            k: Number of results the ids were retrieved with
+            index_version: Identifier of the index the ids belong to
+
+        Returns:
+            List of row ids, or None when not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ids FROM hits WHERE key = ? AND k = ? AND index_version = ?",
+                (self.key(text), k, index_version),
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.int64).tolist()
+
+    def put_hits(self, text: str, k: int, index_version: str, ids: Sequence[int]) -> None:
+        """Store the FAISS row ids retrieved for a question."""
+        blob = np.asarray(ids, dtype=np.int64).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hits (key, k, index_version, ids, updated_ts) VALUES (?, ?, ?, ?, ?)",
+                (self.key(text), k, index_version, blob, int(time.time())),
+            )
+            self._conn.commit()
+
+    def _get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+                return vec
+            row = self._conn.execute("SELECT embedding FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            vec = np.frombuffer(row[0], dtype=np.float32)
+            self._remember(key, vec)
+            return vec
+
+    def _put_many(self, items: List[tuple]) -> None:
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding, updated_ts) VALUES (?, ?, ?)",
+                [(key, np.asarray(vec, dtype=np.float32).tobytes(), now) for key, vec in items],
+            )
+            self._conn.commit()
+            for key, vec in items:
+                self._remember(key, vec)
+
+    def _remember(self, key: bytes, vec: np.ndarray) -> None:
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_query_cache(path: str, model_name: str) -> Optional[QueryCache]:
+    """
+    Open the query cache, or return None when disabled or unavailable.
+
+    Args:
+        path: SQLite database file (empty string disables the cache)
+        model_name: Embedding model name
+
+    Returns:
+        QueryCache instance or None
+    """
+    if not path:
+        return None
+    try:
+        cache = QueryCache(path, model_name)
+        logger.info(f"Query cache at {path}")
+        return cache
+    except Exception as e:
+        logger.warning(f"Query cache unavailable: {e}")
+        return None
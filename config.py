@@ -36,6 +36,55 @@ class Settings:
         self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "50"))
         self.vector_db_path = os.getenv("VECTOR_DB_PATH", "./vector_db")
         self.top_k_results = int(os.getenv("TOP_K_RESULTS", "4"))
+        # Source previews returned with an answer (0 = one per retrieved chunk)
+        self.max_sources = int(os.getenv("MAX_SOURCES", "0"))
+
+        # Reranking (cross-encoder over a wider candidate pool)
+        self.use_reranker = os.getenv("USE_RERANKER", "false").lower() == "true"
+        self.reranker_model = os.getenv(
+            "RERANKER_MODEL",
+            "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+        )
+        self.rerank_candidates_factor = int(os.getenv("RERANK_CANDIDATES_FACTOR", "4"))
+
+        # Response caching (exact-match + semantic); size 0 disables caching
+        self.response_cache_size = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+        self.use_semantic_cache = os.getenv("USE_SEMANTIC_CACHE", "true").lower() == "true"
+        self.semantic_cache_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+        # LLM micro-batching for concurrent async requests (size 1 disables)
+        self.llm_batch_size = int(os.getenv("LLM_BATCH_SIZE", "6"))
+        self.llm_batch_wait_ms = int(os.getenv("LLM_BATCH_WAIT_MS", "25"))
+
+        # Coalescing of concurrent retrieval-API searches into one FAISS query (size 1 disables)
+        self.search_batch_size = int(os.getenv("SEARCH_BATCH_SIZE", "32"))
+        self.search_batch_wait_ms = int(os.getenv("SEARCH_BATCH_WAIT_MS", "5"))
+
+        # Persistent SQLite cache of query embeddings and search hits (empty path disables)
+        self.query_cache_path = os.getenv("QUERY_CACHE_PATH", "./cache/query_cache.sqlite3")
+
+        # Persistent on-disk cache of LLM answers keyed on the prompt (empty dir disables)
+        self.llm_cache_dir = os.getenv("LLM_CACHE_DIR", "/tmp/rag_llm_cache")
+        self.llm_cache_size_mb = int(os.getenv("LLM_CACHE_SIZE_MB", "200"))
+        self.llm_cache_ttl_hours = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+        # Answers sampled above this temperature are too varied to replay
+        self.llm_cache_max_temperature = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
+
+        # Speech-to-text: "faster_whisper" (CTranslate2), "whisper" (PyTorch) or
+        # "whisper_trt" (TensorRT, GPU, English-only);
+        # empty compute type picks int8_float16 on GPU and int8 on CPU
+        self.whisper_backend = os.getenv("WHISPER_BACKEND", "faster_whisper")
+        self.whisper_compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "")
+        # VAD chunks decoded per batch by faster_whisper (1 disables batching)
+        self.whisper_batch_size = int(os.getenv("WHISPER_BATCH_SIZE", "16"))
+        # Audio files transcribed concurrently on one shared faster_whisper model
+        self.whisper_workers = int(os.getenv("WHISPER_WORKERS", "1"))
+        # Replay language detection as a captured CUDA graph (whisper backend, GPU)
+        self.whisper_cuda_graph = os.getenv("WHISPER_CUDA_GRAPH", "true").lower() == "true"
+        # torch.compile the decoder into CUDA graphs at load (whisper backend, GPU)
+        self.whisper_compile = os.getenv("WHISPER_COMPILE", "false").lower() == "true"
+        # TensorRT engine file for WHISPER_BACKEND=whisper_trt (empty uses its default cache)
+        self.whisper_trt_engine = os.getenv("WHISPER_TRT_ENGINE", "")
 
         # Data Paths
         self.data_folder = os.getenv("DATA_FOLDER", "./data")
@@ -46,10 +95,25 @@ class Settings:
         self.api_host = os.getenv("API_HOST", "0.0.0.0")
         self.api_port = int(os.getenv("API_PORT", "8000"))
         self.api_reload = os.getenv("API_RELOAD", "false").lower() == "true"
+        self.api_workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        # Load models and the index before serving instead of on the first request
+        self.warmup_on_startup = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+        # Comma-separated allowed origins; "*" allows any origin without credentials
+        self.cors_origins = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
+        # Gzip responses of at least this many bytes (0 disables); moderate
+        # levels keep CPU cost below the bandwidth saved on KB-sized JSON
+        self.gzip_minimum_size = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+        self.gzip_compress_level = int(os.getenv("GZIP_COMPRESS_LEVEL", "5"))
+        # Per-request access lines cost a format + write even for /health probes
+        self.api_access_log = os.getenv("API_ACCESS_LOG", "false").lower() == "true"
 
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         self.log_file = os.getenv("LOG_FILE", "app.log")
+        # One JSON object per line on the console (for log shippers)
+        self.log_json = os.getenv("LOG_JSON", "false").lower() == "true"
+        # Fraction of per-request info logs kept (errors are never sampled)
+        self.log_sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
 
     def validate_config(self) -> None:
         # Only require API keys if LLM mode is explicitly enabled
@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures.
+
+Models, the vector store and the apps are loaded once per test session and
+shared by every test module; the API tests call the apps in-process through
+TestClient instead of starting a server.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def chatbot():
+    """SimpleChatbot over the on-disk vector store."""
+    from ask import SimpleChatbot
+    return SimpleChatbot()
+
+
+@pytest.fixture(scope="session")
+def vector_store():
+    """The FAISS vector store built by ingest.py."""
+    from ingest import DataIngestionPipeline
+    store = DataIngestionPipeline().load_vector_store()
+    if store is None:
+        pytest.skip("Vector store not found; run python ingest.py")
+    return store
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for retrieval_api; entering it runs the startup warmup."""
+    from retrieval_api import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def simple_client():
+    """TestClient for simple_api; entering it initializes the engine."""
+    from simple_api import app
+    with TestClient(app) as test_client:
+        yield test_client
@@ -13,8 +13,9 @@ import argparse
 import shutil
 import pickle
 import os
+import tempfile
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -32,6 +33,33 @@ EMBEDDING_MODEL = os.getenv("MULTILINGUAL_EMBEDDING_MODEL", "sentence-transforme
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
 BATCH_SIZE = int(os.getenv("EMB_BATCH_SIZE", "64"))
+# IVF index settings: corpora below FAISS_IVF_MIN_VECTORS keep an exact flat
+# index; FAISS_NLIST=0 picks ~4*sqrt(N) inverted lists automatically.
+FAISS_IVF_MIN_VECTORS = int(os.getenv("FAISS_IVF_MIN_VECTORS", "10000"))
+FAISS_NLIST = int(os.getenv("FAISS_NLIST", "0"))
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "32"))
+# Compression of IVF list vectors: "none" (float32), "sq8" (int8 scalar
+# quantizer, 4x smaller) or "pq" (product quantizer, FAISS_PQ_M bytes/vector;
+# 0 picks dim/8 sub-quantizers)
+FAISS_QUANTIZATION = os.getenv("FAISS_QUANTIZATION", "none").lower()
+FAISS_PQ_M = int(os.getenv("FAISS_PQ_M", "0"))
+# Approximate index type for corpora of FAISS_IVF_MIN_VECTORS or more:
+# "ivf" (inverted lists, optionally quantized), "hnsw" (graph, float32,
+# tuned by FAISS_HNSW_EF_SEARCH) or "flat" (always exact)
+FAISS_INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "ivf").lower()
+FAISS_HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+FAISS_HNSW_EF_SEARCH = int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))
+# Storage precision of flat and HNSW vectors (and IVF lists when
+# FAISS_QUANTIZATION is "none"): "fp32", "fp16" (half the memory and scan
+# bandwidth, near-identical top-k) or "int8" (a quarter)
+FAISS_VECTOR_PRECISION = os.getenv("FAISS_VECTOR_PRECISION", "fp32").lower()
+# Rebuild a legacy flat index at load time when it has outgrown the threshold
+FAISS_MIGRATE_FLAT = os.getenv("FAISS_MIGRATE_FLAT", "true").lower() == "true"
+# Map index.faiss read-only instead of copying it onto the heap, so uvicorn
+# workers share one copy through the page cache
+FAISS_MMAP = os.getenv("FAISS_MMAP", "true").lower() == "true"
+# OpenMP threads Faiss uses to parallelize batched searches
+FAISS_OMP_THREADS = int(os.getenv("FAISS_OMP_THREADS", str(min(4, os.cpu_count() or 1))))
 
 
 def find_files(folder: Path, exts: List[str]) -> List[Path]:
@@ -65,6 +93,150 @@ def extract_text_from_txt(path: Path) -> str:
             return ""
 
 
+def _scalar_quantizer_type() -> Optional[int]:
+    """Map FAISS_VECTOR_PRECISION to a ScalarQuantizer type (None for fp32)."""
+    if FAISS_VECTOR_PRECISION == "fp16":
+        return faiss.ScalarQuantizer.QT_fp16
+    if FAISS_VECTOR_PRECISION == "int8":
+        return faiss.ScalarQuantizer.QT_8bit
+    if FAISS_VECTOR_PRECISION != "fp32":
+        logger.warning(f"Unknown FAISS_VECTOR_PRECISION={FAISS_VECTOR_PRECISION!r}; storing float32 vectors")
+    return None
+
+
+def build_index(emb_matrix: np.ndarray) -> faiss.Index:
+    """Build an inner-product index over L2-normalized embeddings.
+
+    Small corpora use an exact flat index. Larger ones use an IVF index,
+    which scans only `nprobe` of `nlist` inverted lists per query, storing
+    list vectors as float32, int8 (sq8) or PQ codes per FAISS_QUANTIZATION,
+    or an HNSW graph when FAISS_INDEX_TYPE is "hnsw". Flat and HNSW vectors
+    (and unquantized IVF lists) are stored at FAISS_VECTOR_PRECISION.
+    """
+    n, dim = emb_matrix.shape
+    qtype = _scalar_quantizer_type()
+    if n < FAISS_IVF_MIN_VECTORS or FAISS_INDEX_TYPE == "flat":
+        if qtype is None:
+            index = faiss.IndexFlatIP(dim)
+        else:
+            index = faiss.IndexScalarQuantizer(dim, qtype, faiss.METRIC_INNER_PRODUCT)
+            index.train(emb_matrix)
+        index.add(emb_matrix)
+        return index
+
+    if FAISS_INDEX_TYPE == "hnsw":
+        logger.info(f"Building HNSW index with M={FAISS_HNSW_M} on {n} vectors...")
+        if qtype is None:
+            index = faiss.IndexHNSWFlat(dim, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexHNSWSQ(dim, qtype, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.train(emb_matrix)
+        index.add(emb_matrix)
+        tune_index(index)
+        return index
+
+    # ~4*sqrt(N) lists, keeping at least 39 training points per list
+    nlist = FAISS_NLIST or int(4 * np.sqrt(n))
+    nlist = max(1, min(nlist, n // 39))
+    logger.info(f"Training IVF index with nlist={nlist} on {n} vectors...")
+    quantizer = faiss.IndexFlatIP(dim)
+    if FAISS_QUANTIZATION == "sq8":
+        index = faiss.IndexIVFScalarQuantizer(
+            quantizer, dim, nlist, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+    elif FAISS_QUANTIZATION == "pq":
+        m = FAISS_PQ_M or next(m for m in range(max(1, dim // 8), 0, -1) if dim % m == 0)
+        if dim % m:
+            raise ValueError(f"FAISS_PQ_M={m} must divide the embedding dimension {dim}")
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+    else:
+        if FAISS_QUANTIZATION != "none":
+            logger.warning(f"Unknown FAISS_QUANTIZATION={FAISS_QUANTIZATION!r}; storing float32 vectors")
+        if qtype is None:
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, qtype, faiss.METRIC_INNER_PRODUCT)
+    logger.info(
+        f"Using {type(index).__name__} (quantization={FAISS_QUANTIZATION}, precision={FAISS_VECTOR_PRECISION})"
+    )
+    index.train(emb_matrix)
+    index.add(emb_matrix)
+    tune_index(index)
+    return index
+
+
+def tune_index(index: faiss.Index) -> None:
+    """Apply the search-time knobs (IVF nprobe, HNSW efSearch) to an index."""
+    hnsw = getattr(index, "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+        logger.info(f"HNSW index: M={FAISS_HNSW_M}, efSearch={hnsw.efSearch}")
+        return
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except Exception:
+        return  # flat index: exact search, nothing to tune
+    ivf.nprobe = min(FAISS_NPROBE, ivf.nlist)
+    logger.info(f"IVF index: nlist={ivf.nlist}, nprobe={ivf.nprobe}")
+
+
+def read_index(path: Path) -> Tuple[faiss.Index, bool]:
+    """
+    Read an index, memory-mapping it when FAISS_MMAP is set.
+
+    Args:
+        path: index.faiss file
+
+    Returns:
+        Tuple of (index, whether it is memory-mapped)
+    """
+    if FAISS_MMAP:
+        # IO_FLAG_MMAP_IFC (FAISS >= 1.10) maps flat codes and IVF lists alike;
+        # older versions can only map IVF lists. The two flags do not combine.
+        flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+        try:
+            return faiss.read_index(str(path), flags), True
+        except Exception as e:
+            logger.warning(f"Memory-mapping {path} failed ({e}); reading it into memory")
+    return faiss.read_index(str(path)), False
+
+
+def write_index(index: faiss.Index, path: Path) -> None:
+    """Write an index through a temp file and rename, so processes that
+    memory-mapped the old file keep reading a consistent copy. The temp
+    name is unique so concurrent writers never share a half-written file."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        faiss.write_index(index, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def describe_index(index: faiss.Index) -> Dict[str, Any]:
+    """Summarize an index and its recall/latency tradeoff for diagnostics."""
+    info: Dict[str, Any] = {"type": type(index).__name__, "ntotal": int(index.ntotal)}
+    storage = faiss.downcast_index(index.storage) if hasattr(index, "storage") else index
+    code_size = getattr(storage, "code_size", None)
+    if code_size is not None:
+        info["bytes_per_vector"] = int(code_size)
+    hnsw = getattr(index, "hnsw", None)
+    if hnsw is not None:
+        info["ef_search"] = int(hnsw.efSearch)
+        info["tradeoff"] = "Approximate graph search; raise FAISS_HNSW_EF_SEARCH for recall, lower it for latency."
+        return info
+    try:
+        ivf = faiss.extract_index_ivf(index)
+        info["nlist"] = int(ivf.nlist)
+        info["nprobe"] = int(ivf.nprobe)
+        info["tradeoff"] = "Approximate list scan; raise FAISS_NPROBE for recall, lower it for latency."
+    except Exception:
+        info["tradeoff"] = "Exact search; latency grows linearly with the corpus."
+    return info
+
+
 def chunk_text(text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[str]:
     if not text:
         return []
@@ -81,32 +253,95 @@ def chunk_text(text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP)
     return chunks
 
 
+def stringify_metadata(metas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Coerce metadata values to str in place, so API responses can use them as-is."""
+    for meta in metas:
+        for key, value in meta.items():
+            if not isinstance(value, str):
+                meta[key] = str(value)
+    return metas
+
+
+class DocLike:
+    def __init__(self, page_content: str, metadata: Dict[str, Any]):
+        self.page_content = page_content
+        self.metadata = metadata
+    def get(self, key, default=None):
+        if key == "page_content":
+            return self.page_content
+        if key == "metadata":
+            return self.metadata
+        return default
+
+
 class FaissWrapper:
-    def __init__(self, index: faiss.Index, metas: List[Dict[str, Any]], embed_model: SentenceTransformer):
+    def __init__(
+        self,
+        index: faiss.Index,
+        metas: List[Dict[str, Any]],
+        embed_model: SentenceTransformer,
+        version: str = "",
+        mmapped: bool = False,
+    ):
         self.index = index
         self.metas = metas
         self.embed_model = embed_model
+        # Identifies the on-disk index the row ids belong to (for caches keyed on ids)
+        self.version = version
+        self.mmapped = mmapped
+        # Document vectors are L2-normalized at build time, so inner product
+        # equals cosine similarity; queries need the same normalization.
+        # The metric is persisted inside index.faiss itself.
+        self.normalize_queries = index.metric_type == faiss.METRIC_INNER_PRODUCT
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a query into a (1, d) float32 array ready for `index.search`."""
+        q_emb = self.embed_model.encode([query], convert_to_numpy=True)
+        q_emb = np.ascontiguousarray(q_emb, dtype="float32")
+        if self.normalize_queries:
+            faiss.normalize_L2(q_emb)
+        return q_emb
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed several queries in one forward pass into a (n, d) float32 array."""
+        q_embs = self.embed_model.encode(queries, convert_to_numpy=True)
+        q_embs = np.ascontiguousarray(q_embs, dtype="float32")
+        if self.normalize_queries:
+            faiss.normalize_L2(q_embs)
+        return q_embs
+
+    def describe(self) -> Dict[str, Any]:
+        """Index type, size, search knobs and recall/latency tradeoff."""
+        return {**describe_index(self.index), "mmap": self.mmapped}
 
     def similarity_search(self, query: str, k: int = 4) -> List[Dict[str, Any]]:
-        q_emb = self.embed_model.encode([query], convert_to_numpy=True)
-        q_emb = q_emb.astype("float32")
-        faiss.normalize_L2(q_emb)
-        D, I = self.index.search(q_emb, k)
+        return self.similarity_search_by_vector(self.embed_query(query), k)
+
+    def similarity_search_by_vector(self, q_emb: np.ndarray, k: int = 4) -> List[Dict[str, Any]]:
+        return self.similarity_search_by_vectors(q_emb, k)[0]
+
+    def similarity_search_batch(self, queries: List[str], k: int = 4) -> List[List[Dict[str, Any]]]:
+        """Search several queries with one encode call and one `index.search`."""
+        if not queries:
+            return []
+        return self.similarity_search_by_vectors(self.embed_queries(queries), k)
+
+    def similarity_search_by_vectors(self, q_embs: np.ndarray, k: int = 4) -> List[List[Dict[str, Any]]]:
+        return [self.docs_for_ids(row) for row in self.search_ids(q_embs, k)]
+
+    def search_ids(self, q_embs: np.ndarray, k: int = 4) -> np.ndarray:
+        """Return the (n, k) FAISS row ids for a batch of query embeddings."""
+        # Faiss parallelizes a 2D query matrix internally, so a batch costs
+        # one Python->C crossing instead of one per query
+        D, I = self.index.search(q_embs, k)
+        return I
+
+    def docs_for_ids(self, ids) -> List[Dict[str, Any]]:
+        """Rebuild documents for FAISS row ids, skipping padding (-1) entries."""
+        n_metas = len(self.metas)
         results: List[Dict[str, Any]] = []
-
-        class DocLike:
-            def __init__(self, page_content: str, metadata: Dict[str, Any]):
-                self.page_content = page_content
-                self.metadata = metadata
-            def get(self, key, default=None):
-                if key == "page_content":
-                    return self.page_content
-                if key == "metadata":
-                    return self.metadata
-                return default
-
-        for idx in I[0]:
-            if idx < 0 or idx >= len(self.metas):
+        for idx in ids:
+            if idx < 0 or idx >= n_metas:
                 continue
             meta = self.metas[idx]
             page = meta.get("text", "")
@@ -166,18 +401,16 @@ class DataIngestionPipeline:
 
         logger.info("Normalizing embeddings and building FAISS index...")
         faiss.normalize_L2(emb_matrix)
-        dim = emb_matrix.shape[1]
-        index = faiss.IndexFlatIP(dim)
-        index.add(emb_matrix)
+        index = build_index(emb_matrix)
 
         VECTOR_DIR.mkdir(parents=True, exist_ok=True)
         index_path = VECTOR_DIR / "index.faiss"
         meta_path = VECTOR_DIR / "index.pkl"
 
         logger.info(f"Writing FAISS index to {index_path}...")
-        faiss.write_index(index, str(index_path))
+        write_index(index, index_path)
         with open(meta_path, "wb") as f:
-            pickle.dump(all_chunks, f)
+            pickle.dump(stringify_metadata(all_chunks), f)
 
         logger.success(f"FAISS index created with {index.ntotal} vectors at {VECTOR_DIR}")
 
@@ -192,10 +425,41 @@ class DataIngestionPipeline:
 
         try:
             logger.info(f"Loading FAISS index from {index_path}...")
-            index = faiss.read_index(str(index_path))
+            index, mmapped = read_index(index_path)
+            faiss.omp_set_num_threads(FAISS_OMP_THREADS)
+            logger.info(f"Loaded {type(index).__name__} with {index.ntotal} vectors (mmap={mmapped})")
+            if (
+                FAISS_MIGRATE_FLAT
+                and isinstance(index, faiss.IndexFlat)
+                and (
+                    (FAISS_INDEX_TYPE != "flat" and index.ntotal >= FAISS_IVF_MIN_VECTORS)
+                    or FAISS_VECTOR_PRECISION in ("fp16", "int8")
+                )
+            ):
+                # Built before the corpus crossed the threshold (or by an older
+                # version, or at float32): rebuild per the current settings and
+                # persist it
+                logger.info(f"Migrating float32 flat index (precision={FAISS_VECTOR_PRECISION})...")
+                index = build_index(index.reconstruct_n(0, index.ntotal))
+                write_index(index, index_path)
+                if FAISS_MMAP:
+                    # Map the persisted copy too, so workers keep sharing it
+                    index, mmapped = read_index(index_path)
+                    tune_index(index)
+            else:
+                tune_index(index)
             with open(meta_path, "rb") as f:
-                metas = pickle.load(f)
-            wrapper = FaissWrapper(index=index, metas=metas, embed_model=SentenceTransformer(self.model_name))
+                # Older indexes stored non-string values (e.g. int chunk_id);
+                # coerce once here instead of on every request
+                metas = stringify_metadata(pickle.load(f))
+            stat = index_path.stat()
+            wrapper = FaissWrapper(
+                index=index,
+                metas=metas,
+                embed_model=SentenceTransformer(self.model_name),
+                version=f"{stat.st_mtime_ns}-{index.ntotal}",
+                mmapped=mmapped,
+            )
             logger.success("Vector DB loaded successfully")
             return wrapper
         except Exception as e:
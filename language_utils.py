@@ -3,12 +3,17 @@ Language detection and handling utilities for multilingual support.
 Supports English, Hindi, Telugu, and Kannada.
 """
 
+import re
+import unicodedata
 from typing import Optional
 from langdetect import detect, LangDetectException
 from loguru import logger
 
 from config import settings
 
+# Detection runs on every request, so its logs are sampled (LOG_SAMPLE_RATE)
+_request_logger = logger.bind(sampled=True)
+
 
 # Language code mappings
 LANGUAGE_NAMES = {
@@ -26,6 +31,17 @@ LANGDETECT_TO_ISO = {
     "kn": "kn"
 }
 
+# Indic scripts live in disjoint Unicode blocks, so counting letters per
+# block identifies them without running the statistical detector. The
+# danda and double danda (U+0964/U+0965) are left out of Devanagari: Telugu
+# and Kannada text uses them as sentence ends too.
+_SCRIPT_RANGES = (
+    ("hi", re.compile(r"[\u0900-\u0963\u0966-\u097F]")),  # Devanagari
+    ("te", re.compile(r"[\u0C00-\u0C7F]")),  # Telugu
+    ("kn", re.compile(r"[\u0C80-\u0CFF]")),  # Kannada
+)
+_LATIN_LETTER_RE = re.compile(r"[A-Za-z]")
+
 
 class LanguageDetector:
     """Handles language detection for multilingual text."""
@@ -49,6 +65,14 @@ class LanguageDetector:
             logger.warning("Empty text provided, using default language")
             return self.default_language
         
+        # Fast path: the Indic script with the most letters wins, unless
+        # Latin letters outnumber it (e.g. English quoting a Sanskrit word)
+        if not text.isascii():
+            count, code = max((len(pattern.findall(text)), code) for code, pattern in _SCRIPT_RANGES)
+            if count > len(_LATIN_LETTER_RE.findall(text)) and code in self.supported_languages:
+                _request_logger.info("Detected language: {}", LANGUAGE_NAMES.get(code, code))
+                return code
+        
         try:
             detected = detect(text)
             
@@ -57,7 +81,7 @@ class LanguageDetector:
             
             # Check if supported
             if iso_code in self.supported_languages:
-                logger.info(f"Detected language: {LANGUAGE_NAMES.get(iso_code, iso_code)}")
+                _request_logger.info("Detected language: {}", LANGUAGE_NAMES.get(iso_code, iso_code))
                 return iso_code
             else:
                 logger.warning(
@@ -133,9 +157,10 @@ def format_multilingual_response(answer: str, language: str) -> str:
     answer = answer.strip()
     
     # Add any language-specific formatting if needed
-    if language in ["hi", "te", "kn"]:
-        # Ensure proper Unicode normalization for Indic scripts
-        import unicodedata
-        answer = unicodedata.normalize('NFC', answer)
+    if language in ("hi", "te", "kn") and not answer.isascii():
+        # Ensure proper Unicode normalization for Indic scripts; the quick
+        # check skips the rewrite for text that is already NFC
+        if not unicodedata.is_normalized('NFC', answer):
+            answer = unicodedata.normalize('NFC', answer)
     
     return answer
@@ -3,6 +3,7 @@ Logging configuration for the Sai Baba Guidance Chatbot.
 Centralizes logging setup using loguru.
 """
 
+import random
 import sys
 from pathlib import Path
 from loguru import logger
@@ -10,6 +11,13 @@ from loguru import logger
 from config import settings
 
 
+def _sample(record) -> bool:
+    """Drop a share of records bound with ``sampled=True`` per LOG_SAMPLE_RATE."""
+    if record["extra"].get("sampled") and record["level"].no < 30:
+        return random.random() < settings.log_sample_rate
+    return True
+
+
 def setup_logging():
     """
     Configure logging for the application.
@@ -18,12 +26,19 @@ def setup_logging():
     # Remove default handler
     logger.remove()
     
-    # Console handler with color
+    # Console handler with color (or JSON lines). Records are formatted and
+    # written by a background thread, so request threads never wait on the
+    # handler lock; tracebacks skip variable values.
     logger.add(
         sys.stderr,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level=settings.log_level,
-        colorize=True
+        colorize=not settings.log_json,
+        serialize=settings.log_json,
+        filter=_sample,
+        enqueue=True,
+        backtrace=False,
+        diagnose=False
     )
     
     # File handler
@@ -35,7 +50,10 @@ def setup_logging():
         rotation="10 MB",  # Rotate when file reaches 10 MB
         retention="30 days",  # Keep logs for 30 days
         compression="zip",  # Compress rotated logs
-        enqueue=True  # Thread-safe logging
+        filter=_sample,
+        enqueue=True,  # Thread-safe logging
+        backtrace=False,
+        diagnose=False
     )
     
     logger.info("Logging configured successfully")
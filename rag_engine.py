@@ -4,9 +4,24 @@ Supports English, Hindi, Telugu, and Kannada with automatic language detection.
 """
 
 import re
-from typing import Optional, Dict, List
+import copy
+import time
+import asyncio
+import hashlib
+import threading
+import unicodedata
+import concurrent.futures
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, List, AsyncIterator, Tuple
 from loguru import logger
 
+try:
+    import numpy as np
+except Exception:
+    np = None
+
 # Optional imports for LangChain-related features. These are guarded so the
 # module can be imported in simpler environments (CLI or tests) without
 # requiring the full set of optional dependencies to be installed.
@@ -17,6 +32,7 @@ try:
     from langchain_google_genai import ChatGoogleGenerativeAI
     from langchain_core.prompts import PromptTemplate
     from langchain_core.documents import Document
+    from langchain_core.messages import HumanMessage, SystemMessage
     HAS_LANGCHAIN = True
 except Exception:
     FAISS = None
@@ -25,6 +41,8 @@ except Exception:
     ChatGoogleGenerativeAI = None
     PromptTemplate = None
     Document = None
+    HumanMessage = None
+    SystemMessage = None
     HAS_LANGCHAIN = False
 
 from config import settings
@@ -35,97 +53,448 @@ DataIngestionPipeline = None
 from language_utils import LanguageDetector, get_language_specific_prompt, format_multilingual_response
 
 
+# Per-request info logs; LOG_SAMPLE_RATE keeps a share of them (see logger_config)
+_request_logger = logger.bind(sampled=True)
+
+_WS_RE = re.compile(r"\s+")
+_PARA_RE = re.compile(r"\n\s*\n")
+# End of a sentence (Latin or Devanagari punctuation) or a line, where a
+# streamed answer can be released
+_SENTENCE_END_RE = re.compile(r"[.!?\u0964\u0965]\s|\n")
+
+# Localized response strings, shared read-only by every request
+_NO_INFO_MSGS = MappingProxyType({
+    "en": "This guidance is not available in Sai Baba's teachings.",
+    "hi": "यह मार्गदर्शन साईं बाबा की शिक्षाओं में उपलब्ध नहीं है।",
+    "te": "ఈ మార్గదర్శకత్వం సాయి బాబా బోధలలో అందుబాటులో లేదు।",
+    "kn": "ಈ ಮಾರ್ಗದರ್ಶನವು ಸಾಯಿಬಾಬಾ ಅವರ ಬೋಧನೆಗಳಲ್ಲಿ ಲಭ್ಯವಿಲ್ಲ."
+})
+
+_ERROR_MSGS = MappingProxyType({
+    "en": "I apologize, but I encountered an error while processing your question. Please try rephrasing your question or try again later.",
+    "hi": "क्षमा करें, आपके प्रश्न को संसाधित करते समय एक त्रुटि हुई। कृपया अपना प्रश्न दोबारा लिखें या बाद में पुनः प्रयास करें।",
+    "te": "క్షమించండి, మీ ప్రశ్నను ప్రాసెస్ చేయడంలో లోపం ఏర్పడింది. దయచేసి మీ ప్రశ్నను తిరిగి వ్రాయండి లేదా తర్వాత మళ్లీ ప్రయత్నించండి।",
+    "kn": "ಕ್ಷಮಿಸಿ, ನಿಮ್ಮ ಪ್ರಶ್ನೆಯನ್ನು ಪ್ರಕ್ರಿಯೆಗೊಳಿಸುವಲ್ಲಿ ದೋಷ ಎದುರಾಗಿದೆ. ದಯವಿಟ್ಟು ನಿಮ್ಮ ಪ್ರಶ್ನೆಯನ್ನು ಪುನಃ ಬರೆಯಿರಿ ಅಥವಾ ನಂತರ ಮತ್ತೆ ಪ್ರಯತ್ನಿಸಿ."
+})
+
+# Devotional address and closing used by RAG-only answers
+_PREFIXES = MappingProxyType({
+    'en': "My child,",
+    'hi': "मेरे बच्चे,",
+    'te': "నా బిడ్డా,",
+    'kn': "ನನ್ನ ಮಕ್ಕಳೆ,"
+})
+
+_CLOSINGS = MappingProxyType({
+    'en': " May you find peace and strength in these teachings.",
+    'hi': " इन शिक्षाओं में आपको शांति और शक्ति मिले।",
+    'te': " ఈ బోధనలలో మీకో శాంతి మరియు శక్తి లభించాలి.",
+    'kn': "ಈ ಬೋಧನೆಗಳಲ್ಲಿ ನಿಮಗೆ ಶಾಂತಿ ಮತ್ತು ಶಕ್ತಿ ದೊರಕಲಿ."
+})
+
+# Persona and guidelines shared by the single-question and batch prompts
+_PROMPT_GUIDELINES = """You are a humble, compassionate spiritual guide in the voice of a gentle, divine mentor inspired by Sai Baba's teachings.
+
+GUIDELINES (MUST FOLLOW):
+- Speak softly and lovingly; open by addressing the user gently (for example "My child,").
+- Use calm, reassuring, devotional language and offer consolation, moral counsel, and spiritual perspective.
+- Write a single flowing answer of 1–2 meaningful paragraphs (no bullet lists).
+- Do NOT mention AI, models, PDFs, sources, or system internals in the answer; do not describe your process.
+- Use the retrieved context strictly as grounding: never contradict the content in the context.
+- If the context partially answers the question, blend its meaning with compassionate spiritual guidance.
+- If the context does not directly answer, respond with faith-based, reflective guidance rather than refusing.
+- NEVER provide medical, legal, or harmful instructions."""
+
+# The prompt is split into a static prefix (persona, guidelines and language
+# instruction, identical across calls for a given language) and a per-request
+# suffix. Sent as a system message followed by a user message, the prefix
+# stays byte-identical so provider-side prompt caching can reuse it.
+_PROMPT_STATIC_HEADER = "\n" + _PROMPT_GUIDELINES + "\n\n"
+
+_LANGUAGE_INSTRUCTION_TEMPLATE = """LANGUAGE INSTRUCTION:
+{language_instruction}
+"""
+
+_PROMPT_PREFIX_TEMPLATE = _PROMPT_STATIC_HEADER + _LANGUAGE_INSTRUCTION_TEMPLATE
+
+_PROMPT_SUFFIX_TEMPLATE = """
+CONTEXT (Grounding Passages):
+{context}
+
+QUESTION:
+{question}
+
+Produce the final answer now following the guidelines above.
+Answer:
+"""
+
+# Batch prompting: several questions answered in one LLM call, each answer
+# delimited by numbered markers so it can be split back out. The guidelines
+# are sent separately as the system message.
+_BATCH_PROMPT_TEMPLATE = """Answer each of the following questions independently, using only its own
+language instruction and context. Write the answer to question N between
+[[AN]] and [[/AN]] markers (for example [[A1]] ... [[/A1]]), and nothing else
+outside the markers.
+
+{questions}
+Produce the final answers now following the guidelines above.
+"""
+
+_BATCH_QUESTION_TEMPLATE = """[[Q{index}]]
+LANGUAGE INSTRUCTION:
+{language_instruction}
+
+CONTEXT (Grounding Passages):
+{context}
+
+QUESTION:
+{question}
+[[/Q{index}]]
+"""
+
+_BATCH_ANSWER_RE = re.compile(r"\[\[A(\d+)\]\](.*?)\[\[/A\1\]\]", re.DOTALL)
+
+
+@dataclass(slots=True)
+class Source:
+    """Preview of a retrieved passage backing an answer."""
+    content: str
+    metadata: dict
+    
+    def get(self, key, default=None):
+        """Dict-style access, for callers written against the old result dicts."""
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict[str, any]:
+        return {"content": self.content, "metadata": self.metadata}
+
+
+@dataclass(slots=True)
+class QAResult:
+    """Result of answering one question."""
+    answer: str
+    language: str
+    sources: Tuple[Source, ...] = ()
+    is_safe: bool = True
+    error: Optional[str] = None
+    
+    def get(self, key, default=None):
+        """Dict-style access, for callers written against the old result dicts."""
+        value = getattr(self, key, default)
+        return default if value is None else value
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def to_dict(self) -> Dict[str, any]:
+        """
+        Convert to a JSON-serializable dictionary.
+        
+        Returns:
+            Dictionary with answer, language, sources and is_safe, plus
+            error when one occurred
+        """
+        result = {
+            "answer": self.answer,
+            "language": self.language,
+            "sources": [source.to_dict() for source in self.sources],
+            "is_safe": self.is_safe
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+class ResponseCache:
+    """
+    Bounded two-tier cache of answer_question results.
+    
+    Tier 1 is an exact match on the whitespace-normalized, lowercased question.
+    Tier 2 is a semantic match: cosine similarity between question embeddings,
+    restricted to answers in the same language. Both tiers evict FIFO.
+    """
+    
+    def __init__(self, maxsize: int = 1024, similarity_threshold: float = 0.95, semantic: bool = True):
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self.semantic = semantic and np is not None and maxsize > 0
+        self._exact: "OrderedDict[Tuple[str, bool, str], QAResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Semantic tier: ring buffer of unit-norm embeddings plus parallel entries
+        self._vectors = None
+        self._entries: List[Optional[Tuple[str, bool, QAResult]]] = [None] * max(maxsize, 0)
+        self._next = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+    
+    @staticmethod
+    def make_key(question_lower: str, language: str, include_sources: bool) -> Tuple[str, bool, str]:
+        """Build the exact-match key for a lowercased question."""
+        normalized = _WS_RE.sub(" ", question_lower).strip()
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+        return (language, include_sources, digest)
+    
+    def get(self, key: Tuple[str, bool, str]) -> Optional[QAResult]:
+        """Return a copy of the cached result for exactly this question."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            result = self._exact.get(key)
+        return copy.deepcopy(result) if result is not None else None
+    
+    def get_similar(self, key: Tuple[str, bool, str], embedding) -> Optional[QAResult]:
+        """Return a copy of the cached result for a similar question (semantic tier only)."""
+        if not self.semantic or embedding is None:
+            return None
+        with self._lock:
+            result = self._semantic_lookup(key[0], key[1], embedding)
+        return copy.deepcopy(result) if result is not None else None
+    
+    def put(self, key: Tuple[str, bool, str], result: QAResult, embedding=None) -> None:
+        """Store a copy of a result under the key (and its embedding)."""
+        if not self.enabled:
+            return
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._exact[key] = stored
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.maxsize:
+                self._exact.popitem(last=False)
+            if embedding is not None and self.semantic:
+                self._semantic_add(key[0], key[1], embedding, stored)
+    
+    def _semantic_lookup(self, language: str, include_sources: bool, embedding) -> Optional[QAResult]:
+        if self._vectors is None:
+            return None
+        vec = self._unit(embedding)
+        if vec is None or vec.shape[0] != self._vectors.shape[1]:
+            return None
+        scores = self._vectors @ vec
+        # Only entries above the threshold need ordering, not the whole cache
+        candidates = np.flatnonzero(scores >= self.similarity_threshold)
+        for idx in candidates[np.argsort(-scores[candidates])]:
+            entry = self._entries[idx]
+            if entry is not None and entry[0] == language and entry[1] == include_sources:
+                return entry[2]
+        return None
+    
+    def _semantic_add(self, language: str, include_sources: bool, embedding, result: QAResult) -> None:
+        vec = self._unit(embedding)
+        if vec is None:
+            return
+        if self._vectors is None:
+            self._vectors = np.zeros((self.maxsize, vec.shape[0]), dtype=np.float32)
+        elif vec.shape[0] != self._vectors.shape[1]:
+            return
+        slot = self._next % self.maxsize
+        self._vectors[slot] = vec
+        self._entries[slot] = (language, include_sources, result)
+        self._next += 1
+    
+    @staticmethod
+    def _unit(embedding):
+        vec = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vec))
+        if not norm:
+            return None
+        return vec / norm
+
+
+# Keyword tables for the safety filter. Immutable and built once at import;
+# the SafetyFilter patterns below are compiled from them.
+_MEDICAL_KEYWORDS = frozenset({
+    'disease', 'cure', 'medicine', 'treatment', 'diagnosis', 'symptom',
+    'cancer', 'diabetes', 'covid', 'illness', 'drug', 'prescription',
+    'surgery', 'therapy', 'medical', 'health problem', 'sick'
+})
+
+_LEGAL_KEYWORDS = frozenset({
+    'lawsuit', 'legal advice', 'court', 'lawyer', 'attorney', 'sue',
+    'contract', 'divorce', 'custody', 'will', 'testament', 'rights',
+    'law', 'illegal', 'criminal'
+})
+
+_PREDICTIVE_KEYWORDS = frozenset({
+    'predict', 'future', 'will happen', 'fortune', 'lottery', 'winning',
+    'stock market', 'investment', 'when will', 'prediction', 'foretell'
+})
+
+_DIVINE_CLAIMS = frozenset({
+    'i am god', 'i am divine', 'i am sai baba', 'worship me',
+    'i am omnipotent', 'i am all-knowing'
+})
+
+# No prohibited keyword is shorter than this, so shorter questions skip the scan
+_MIN_KEYWORD_LEN = min(map(len, _MEDICAL_KEYWORDS | _LEGAL_KEYWORDS | _PREDICTIVE_KEYWORDS))
+
+# Every keyword is Latin script; text without a Latin letter cannot match
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+
+def _top_k(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the k highest scores, best first, without a full sort."""
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def _alternation(keywords) -> str:
+    """Regex alternation of literal keywords, longest first for determinism."""
+    return "|".join(map(re.escape, sorted(keywords, key=lambda k: (-len(k), k))))
+
+
 class SafetyFilter:
     """Implements safety and ethical guardrails for responses."""
     
     # Prohibited topics
-    MEDICAL_KEYWORDS = [
-        'disease', 'cure', 'medicine', 'treatment', 'diagnosis', 'symptom',
-        'cancer', 'diabetes', 'covid', 'illness', 'drug', 'prescription',
-        'surgery', 'therapy', 'medical', 'health problem', 'sick'
-    ]
-    
-    LEGAL_KEYWORDS = [
-        'lawsuit', 'legal advice', 'court', 'lawyer', 'attorney', 'sue',
-        'contract', 'divorce', 'custody', 'will', 'testament', 'rights',
-        'law', 'illegal', 'criminal'
-    ]
-    
-    PREDICTIVE_KEYWORDS = [
-        'predict', 'future', 'will happen', 'fortune', 'lottery', 'winning',
-        'stock market', 'investment', 'when will', 'prediction', 'foretell'
-    ]
-    
-    DIVINE_CLAIMS = [
-        'i am god', 'i am divine', 'i am sai baba', 'worship me',
-        'i am omnipotent', 'i am all-knowing'
-    ]
+    MEDICAL_KEYWORDS = _MEDICAL_KEYWORDS
+    LEGAL_KEYWORDS = _LEGAL_KEYWORDS
+    PREDICTIVE_KEYWORDS = _PREDICTIVE_KEYWORDS
+    DIVINE_CLAIMS = _DIVINE_CLAIMS
+    
+    # Cheap substrings that every divine claim contains; used to skip the
+    # per-claim scan for the vast majority of responses.
+    DIVINE_CLAIM_MARKERS = ('i am ', 'worship me')
+    
+    # Case-insensitive versions of the substring checks, used on non-ASCII
+    # text so it never has to be lowercased
+    _DIVINE_MARKER_RE = re.compile("|".join(map(re.escape, DIVINE_CLAIM_MARKERS)), re.IGNORECASE)
+    _UNCERTAIN_RE = re.compile(re.escape("i don't know"), re.IGNORECASE)
+    
+    # Case-insensitive single-pass matcher for divine claims (longest first)
+    _DIVINE_RE = re.compile(
+        _alternation(DIVINE_CLAIMS),
+        re.IGNORECASE
+    )
+    
+    WARNINGS = {
+        "medical": (
+            "I cannot provide medical advice. For health concerns, "
+            "please consult qualified healthcare professionals. "
+            "I can only share general spiritual wisdom from Sai Baba's teachings."
+        ),
+        "legal": (
+            "I cannot provide legal advice. For legal matters, "
+            "please consult qualified legal professionals. "
+            "I can only share spiritual guidance from Sai Baba's teachings."
+        ),
+        "predictive": (
+            "I cannot predict the future or provide fortune-telling. "
+            "I can only share timeless spiritual wisdom from Sai Baba's teachings "
+            "to help guide your present journey."
+        ),
+    }
+    
+    # All prohibited keywords compiled into one alternation so the common
+    # "not prohibited" case is a single C-level scan of the question.
+    # Case-insensitive, so callers never need to lowercase the question.
+    _PROHIBITED_RE = re.compile(
+        _alternation(MEDICAL_KEYWORDS | LEGAL_KEYWORDS | PREDICTIVE_KEYWORDS),
+        re.IGNORECASE
+    )
+    
+    # Per-category patterns, in priority order, used only once a match is found
+    _CATEGORY_PATTERNS = (
+        ("medical", re.compile(_alternation(MEDICAL_KEYWORDS), re.IGNORECASE)),
+        ("legal", re.compile(_alternation(LEGAL_KEYWORDS), re.IGNORECASE)),
+        ("predictive", re.compile(_alternation(PREDICTIVE_KEYWORDS), re.IGNORECASE)),
+    )
     
     @staticmethod
-    def is_prohibited_topic(question: str) -> Optional[str]:
+    def is_prohibited_topic(question: str, question_lower: Optional[str] = None) -> Optional[str]:
         """
         Check if question contains prohibited topics.
         
         Args:
             question: User's question
+            question_lower: Pre-computed ``question.lower()`` (optional)
         
         Returns:
             Warning message if prohibited, None otherwise
         """
-        question_lower = question.lower()
+        if len(question) < _MIN_KEYWORD_LEN:
+            return None
         
-        # Check for medical topics
-        if any(keyword in question_lower for keyword in SafetyFilter.MEDICAL_KEYWORDS):
-            return (
-                "I cannot provide medical advice. For health concerns, "
-                "please consult qualified healthcare professionals. "
-                "I can only share general spiritual wisdom from Sai Baba's teachings."
-            )
+        # Pure Hindi/Telugu/Kannada questions skip the keyword scan entirely
+        if not question.isascii() and not _LATIN_RE.search(question):
+            return None
         
-        # Check for legal topics
-        if any(keyword in question_lower for keyword in SafetyFilter.LEGAL_KEYWORDS):
-            return (
-                "I cannot provide legal advice. For legal matters, "
-                "please consult qualified legal professionals. "
-                "I can only share spiritual guidance from Sai Baba's teachings."
-            )
+        # The patterns ignore case, so an already-lowered copy is only a
+        # convenience; the question itself is never re-lowered here
+        text = question_lower if question_lower is not None else question
         
-        # Check for predictive/fortune-telling
-        if any(keyword in question_lower for keyword in SafetyFilter.PREDICTIVE_KEYWORDS):
-            return (
-                "I cannot predict the future or provide fortune-telling. "
-                "I can only share timeless spiritual wisdom from Sai Baba's teachings "
-                "to help guide your present journey."
-            )
+        if not SafetyFilter._PROHIBITED_RE.search(text):
+            return None
+        
+        # Medical takes precedence over legal, which takes precedence over predictive
+        for category, pattern in SafetyFilter._CATEGORY_PATTERNS:
+            if pattern.search(text):
+                return SafetyFilter.WARNINGS[category]
         
         return None
     
+    DISCLAIMER = (
+        "\n\nNote: This guidance is based on the available teachings. "
+        "For deeper spiritual understanding, consider studying Sai Baba's "
+        "original works and seeking guidance from qualified spiritual teachers."
+    )
+    
+    @staticmethod
+    def remove_divine_claims(response: str, response_lower: Optional[str] = None) -> str:
+        """
+        Rewrite divine claims in a response, or in one sentence of a streamed one.
+        
+        Args:
+            response: Generated text
+            response_lower: Pre-computed ``response.lower()`` (optional)
+        
+        Returns:
+            Text with every divine claim replaced
+        """
+        # Check for divine claims (only when a marker is present at all)
+        if response_lower is not None:
+            needs_scan = any(marker in response_lower for marker in SafetyFilter.DIVINE_CLAIM_MARKERS)
+        else:
+            needs_scan = SafetyFilter._DIVINE_MARKER_RE.search(response) is not None
+        if needs_scan:
+            response, replaced = SafetyFilter._DIVINE_RE.subn("Sai Baba teaches", response)
+            if replaced:
+                logger.warning(f"Detected {replaced} divine claim(s) in response")
+        return response
+    
     @staticmethod
-    def sanitize_response(response: str) -> str:
+    def sanitize_response(response: str, response_lower: Optional[str] = None) -> str:
         """
         Ensure response doesn't contain divine claims.
         
         Args:
             response: Generated response
+            response_lower: Pre-computed ``response.lower()`` (optional)
         
         Returns:
             Sanitized response
         """
-        response_lower = response.lower()
+        # Lowercasing Hindi/Telugu/Kannada text walks the Unicode tables for
+        # nothing; non-ASCII responses use the case-insensitive matchers instead
+        if response_lower is None and response.isascii():
+            response_lower = response.lower()
         
-        # Check for divine claims
-        for claim in SafetyFilter.DIVINE_CLAIMS:
-            if claim in response_lower:
-                logger.warning(f"Detected divine claim in response: {claim}")
-                response = response.replace(claim, "Sai Baba teaches")
+        if response_lower is not None:
+            uncertain = "i don't know" in response_lower
+        else:
+            uncertain = SafetyFilter._UNCERTAIN_RE.search(response) is not None
+        response = SafetyFilter.remove_divine_claims(response, response_lower)
         
         # Add disclaimer if response is very short or uncertain
-        if len(response) < 50 or "i don't know" in response_lower:
-            response += (
-                "\n\nNote: This guidance is based on the available teachings. "
-                "For deeper spiritual understanding, consider studying Sai Baba's "
-                "original works and seeking guidance from qualified spiritual teachers."
-            )
+        if len(response) < 50 or uncertain:
+            response += SafetyFilter.DISCLAIMER
         
         return response
 
@@ -180,6 +549,11 @@ class MultilingualRAGEngine:
             self.pipeline = None
             self.vector_store = None
 
+        # Optional cross-encoder reranker for retrieved candidates
+        self.reranker = None
+        if settings.use_reranker:
+            self.reranker = self._initialize_reranker()
+        
         # Initialize LLM only if explicitly enabled in settings
         self.llm = None
         if settings.use_llm:
@@ -189,9 +563,32 @@ class MultilingualRAGEngine:
         self.safety_filter = SafetyFilter()
         self.language_detector = LanguageDetector()
         
+        # Build the prompt template once; it is identical for every question
+        self._prompt_template = self._create_prompt_template()
+        self._prompt_prefixes: Dict[str, str] = {}
+        # Language instructions for the supported languages, built once
+        self._lang_instr = {lang: get_language_specific_prompt(lang) for lang in settings.supported_languages}
+        self._lang_instr_default = self._lang_instr.get("en") or get_language_specific_prompt("en")
+        
+        # Worker threads for blocking retrieval work issued from async callers
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(settings.llm_batch_size, 4))
+        
+        # Persistent cache of LLM answers keyed on the exact prompt
+        self._llm_cache = self._initialize_llm_cache() if self.llm is not None else None
+        
+        # Cache of recent answers (exact + semantic)
+        self.response_cache = ResponseCache(
+            maxsize=settings.response_cache_size,
+            similarity_threshold=settings.semantic_cache_threshold,
+            semantic=settings.use_semantic_cache
+        )
+        
         # Create retrieval chain
         self.qa_chain = self._create_qa_chain()
         
+        # Last deep validation result as (timestamp, result)
+        self._last_validation = (0.0, {})
+        
         logger.success("Multilingual RAG engine initialized successfully")
         logger.info(f"Supported languages: {', '.join(settings.supported_languages)}")
     
@@ -218,6 +615,57 @@ class MultilingualRAGEngine:
             logger.error(f"Error loading vector store: {e}")
             return None
     
+    def _initialize_reranker(self):
+        """
+        Load the cross-encoder used to rerank retrieved candidates.
+        
+        Returns:
+            CrossEncoder instance, or None if it cannot be loaded
+        """
+        try:
+            import torch  # type: ignore
+            from sentence_transformers import CrossEncoder  # type: ignore
+            
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            logger.info(f"Loading reranker '{settings.reranker_model}' on device '{device}'")
+            reranker = CrossEncoder(settings.reranker_model, device=device)
+            logger.success("Reranker loaded")
+            return reranker
+        except Exception as e:
+            logger.error(f"Failed to load reranker: {e}. Continuing without reranking.")
+            return None
+    
+    def _initialize_llm_cache(self):
+        """
+        Open the on-disk LLM answer cache, so answers survive restarts.
+        
+        Returns:
+            diskcache.Cache instance, or None if disabled or unavailable
+        """
+        if not settings.llm_cache_dir:
+            return None
+        if settings.model_temperature > settings.llm_cache_max_temperature:
+            logger.info(
+                f"LLM answer cache disabled: temperature {settings.model_temperature} "
+                f"exceeds {settings.llm_cache_max_temperature}"
+            )
+            return None
+        try:
+            from diskcache import Cache  # type: ignore
+            
+            cache = Cache(settings.llm_cache_dir, size_limit=settings.llm_cache_size_mb * 1024 * 1024)
+            logger.info(f"LLM answer cache at {settings.llm_cache_dir} ({len(cache)} entries)")
+            return cache
+        except Exception as e:
+            logger.warning(f"LLM answer cache unavailable: {e}")
+            return None
+    
+    @staticmethod
+    def _llm_cache_key(prompt: str) -> str:
+        """Hash the model, temperature and full prompt into a cache key."""
+        raw = f"{settings.ai_provider}|{settings.model_name}|{settings.model_temperature}|{prompt}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=32).hexdigest()
+    
     def _initialize_llm(self):
         """
         Initialize the Language Model based on configuration.
@@ -264,36 +712,16 @@ class MultilingualRAGEngine:
     
     def _create_prompt_template(self) -> PromptTemplate:
         """
-        Create the multilingual prompt template with safety guidelines.
+        Create the per-request part of the multilingual prompt template.
+        
+        The constant persona and guidelines (``_PROMPT_STATIC_HEADER``) are
+        kept out of the template and prepended in ``_format_prompt``, so only
+        the short dynamic part is substituted on each call.
         
         Returns:
             PromptTemplate instance
         """
-        template = """
-You are a humble, compassionate spiritual guide in the voice of a gentle, divine mentor inspired by Sai Baba's teachings.
-
-GUIDELINES (MUST FOLLOW):
-- Speak softly and lovingly; open by addressing the user gently (for example "My child,").
-- Use calm, reassuring, devotional language and offer consolation, moral counsel, and spiritual perspective.
-- Write a single flowing answer of 1–2 meaningful paragraphs (no bullet lists).
-- Do NOT mention AI, models, PDFs, sources, or system internals in the answer; do not describe your process.
-- Use the retrieved context strictly as grounding: never contradict the content in the context.
-- If the context partially answers the question, blend its meaning with compassionate spiritual guidance.
-- If the context does not directly answer, respond with faith-based, reflective guidance rather than refusing.
-- NEVER provide medical, legal, or harmful instructions.
-
-LANGUAGE INSTRUCTION:
-{language_instruction}
-
-CONTEXT (Grounding Passages):
-{context}
-
-QUESTION:
-{question}
-
-Produce the final answer now following the guidelines above.
-Answer:
-"""
+        template = _LANGUAGE_INSTRUCTION_TEMPLATE + _PROMPT_SUFFIX_TEMPLATE
 
         # If LangChain's PromptTemplate isn't available, return the raw template string
         if PromptTemplate is None:
@@ -310,17 +738,12 @@ Answer:
         This is used when an LLM is not available (RAG-only mode).
         """
         if not docs:
-            return {
-                "en": "This guidance is not available in Sai Baba's teachings.",
-                "hi": "यह मार्गदर्शन साईं बाबा की शिक्षाओं में उपलब्ध नहीं है।",
-                "te": "ఈ మార్గదర్శకత్వం సాయి బాబా బోధలలో అందుబాటులో లేదు।",
-                "kn": "ಈ ಮಾರ್ಗದರ್ಶನವು ಸಾಯಿ ಬಾಬಾ ಅವರ ಬೋಧನೆಗಳಲ್ಲಿ ಲಭ್ಯವಿಲ್ಲ."
-            }.get(detected_language, "This guidance is not available in Sai Baba's teachings.")
+            return _NO_INFO_MSGS.get(detected_language, _NO_INFO_MSGS["en"])
 
         # Take top 3 chunks as grounding
-        texts = [re.sub(r"\s+", " ", getattr(d, 'page_content', '')).strip() for d in docs[:3]]
+        texts = (_WS_RE.sub(" ", getattr(d, 'page_content', '')).strip() for d in docs[:3])
         # Keep non-empty parts
-        parts = [t for t in texts if t]
+        parts = list(filter(None, texts))
         if not parts:
             return ""
 
@@ -331,16 +754,10 @@ Answer:
             combined = "\n\n".join(parts[:2])
 
         # Devotional prefix / gentle address per language
-        prefixes = {
-            'en': "My child,",
-            'hi': "मेरे बच्चे,",
-            'te': "నా బిడ్డా,",
-            'kn': "ನನ್ನ ಮಕ್ಕಳೆ,"
-        }
-        prefix = prefixes.get(detected_language, prefixes['en'])
+        prefix = _PREFIXES.get(detected_language, _PREFIXES['en'])
 
         # Compose final answer: prefix + grounded passages + gentle closing if single paragraph
-        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", combined) if p.strip()]
+        paragraphs = [p.strip() for p in _PARA_RE.split(combined) if p.strip()]
         if not paragraphs:
             return prefix + " " + combined
 
@@ -348,17 +765,11 @@ Answer:
         paragraphs[0] = prefix + " " + paragraphs[0]
 
         if len(paragraphs) == 1:
-            closings = {
-                'en': " May you find peace and strength in these teachings.",
-                'hi': " इन शिक्षाओं में आपको शांति और शक्ति मिले।",
-                'te': " ఈ బోధనలలో మీకో శాంతి మరియు శక్తి లభించాలి.",
-                'kn': "ಈ ಬೋಧನೆಗಳಲ್ಲಿ ನಿಮಗೆ ಶಾಂತಿ ಮತ್ತು ಶಕ್ತಿ ದೊರಕಲಿ."
-            }
-            paragraphs[0] = paragraphs[0].strip() + closings.get(detected_language, closings['en'])
+            paragraphs[0] = paragraphs[0].strip() + _CLOSINGS.get(detected_language, _CLOSINGS['en'])
 
         answer = "\n\n".join(paragraphs)
         # Normalize whitespace
-        answer = re.sub(r"\s+", " ", answer).strip()
+        answer = _WS_RE.sub(" ", answer).strip()
         return answer
 
     def _create_qa_chain(self):
@@ -372,12 +783,48 @@ Answer:
         # This will be called directly in answer_question
         return None
     
-    def get_relevant_documents(self, question: str) -> List[Document]:
+    def _embed_question(self, question: str):
+        """
+        Embed a question with the vector store's model, if it supports it.
+        
+        Returns:
+            (1, d) float32 embedding, or None when unavailable
+        """
+        embed_query = getattr(getattr(self, 'vector_store', None), 'embed_query', None)
+        if embed_query is None:
+            return None
+        try:
+            return embed_query(question)
+        except Exception as e:
+            logger.error(f"Error embedding question: {str(e)}")
+            return None
+    
+    def _retrieve(self, question: str, cancelled: Optional[threading.Event] = None) -> Tuple[any, List[Document]]:
+        """
+        Embed a question and retrieve its documents, for running off-thread.
+        
+        Args:
+            question: User's question
+            cancelled: Set by the caller once the documents are no longer
+                needed; checked before the index search starts
+        
+        Returns:
+            Tuple of (query embedding or None, relevant documents)
+        """
+        if cancelled is not None and cancelled.is_set():
+            return None, []
+        query_embedding = self._embed_question(question)
+        if cancelled is not None and cancelled.is_set():
+            return query_embedding, []
+        return query_embedding, self.get_relevant_documents(question, query_embedding)
+    
+    def get_relevant_documents(self, question: str, query_embedding=None) -> List[Document]:
         """
         Retrieve relevant documents for a question.
         
         Args:
             question: User's question
+            query_embedding: Pre-computed question embedding (optional)
         
         Returns:
             List of relevant documents
@@ -387,144 +834,709 @@ Answer:
             logger.debug("No vector store available for retrieval; returning empty results.")
             return []
 
+        k = settings.top_k_results
+        reranker = getattr(self, 'reranker', None)
+        # Over-fetch cheap embedding candidates when a reranker will pick the top k
+        fetch_k = k * settings.rerank_candidates_factor if reranker is not None else k
+        
         try:
-            docs = self.vector_store.similarity_search(
-                question,
-                k=settings.top_k_results
-            )
-            return docs
+            if query_embedding is not None:
+                docs = self.vector_store.similarity_search_by_vector(query_embedding, k=fetch_k)
+            else:
+                docs = self.vector_store.similarity_search(
+                    question,
+                    k=fetch_k
+                )
         except Exception as e:
             logger.error(f"Error retrieving documents: {str(e)}")
             return []
+        
+        return self._rerank(question, docs, k)
     
-    def answer_question(self, question: str, detected_language: Optional[str] = None) -> Dict[str, any]:
+    def get_relevant_documents_batch(self, questions: List[str], query_embeddings=None) -> List[List[Document]]:
+        """
+        Retrieve relevant documents for several questions at once.
+        
+        All questions are embedded in one forward pass and searched with a
+        single ``index.search`` call.
+        
+        Args:
+            questions: User questions
+            query_embeddings: Pre-computed question embeddings, one per question (optional)
+        
+        Returns:
+            List of document lists, aligned with ``questions``
+        """
+        if not questions:
+            return []
+        
+        vector_store = getattr(self, 'vector_store', None)
+        if not vector_store:
+            logger.debug("No vector store available for retrieval; returning empty results.")
+            return [[] for _ in questions]
+        
+        if not hasattr(vector_store, 'similarity_search_by_vectors'):
+            # Store without batch search: fall back to one query at a time
+            if query_embeddings is None:
+                query_embeddings = [None] * len(questions)
+            return [
+                self.get_relevant_documents(question, embedding)
+                for question, embedding in zip(questions, query_embeddings)
+            ]
+        
+        k = settings.top_k_results
+        reranker = getattr(self, 'reranker', None)
+        fetch_k = k * settings.rerank_candidates_factor if reranker is not None else k
+        
+        try:
+            if query_embeddings is not None and all(e is not None for e in query_embeddings):
+                xq = np.vstack(query_embeddings)
+            else:
+                xq = vector_store.embed_queries(questions)
+            docs_per_question = vector_store.similarity_search_by_vectors(xq, k=fetch_k)
+        except Exception as e:
+            logger.error(f"Error retrieving documents: {str(e)}")
+            return [[] for _ in questions]
+        
+        return [
+            self._rerank(question, docs, k)
+            for question, docs in zip(questions, docs_per_question)
+        ]
+    
+    def _rerank(self, question: str, docs: List[Document], k: int) -> List[Document]:
+        """
+        Reorder candidate documents with the cross-encoder and keep the top k.
+        
+        Args:
+            question: User's question
+            docs: Candidate documents in embedding order
+            k: Number of documents to keep
+        
+        Returns:
+            Top k documents (unchanged when no reranker is loaded)
+        """
+        reranker = getattr(self, 'reranker', None)
+        if reranker is None or len(docs) <= k:
+            return docs
+        
+        try:
+            pairs = [(question, doc.page_content) for doc in docs]
+            scores = np.asarray(reranker.predict(pairs, batch_size=32), dtype=np.float32)
+            return [docs[i] for i in _top_k(scores, k)]
+        except Exception as e:
+            logger.error(f"Reranking failed: {e}. Using embedding order.")
+            return docs[:k]
+    
+    def _format_prompt(self, source_docs: List[Document], question: str, language_instruction: str) -> str:
+        """
+        Format the LLM prompt from retrieved documents.
+        
+        Args:
+            source_docs: Retrieved documents used as grounding context
+            question: User's question
+            language_instruction: Language-specific response instruction
+        
+        Returns:
+            Formatted prompt string
+        """
+        # Format context from retrieved documents
+        context = "\n\n".join([doc.page_content for doc in source_docs])
+        
+        # Works for both PromptTemplate and the raw-string fallback
+        return _PROMPT_STATIC_HEADER + self._prompt_template.format(
+            context=context,
+            question=question,
+            language_instruction=language_instruction
+        )
+    
+    def _prompt_prefix(self, detected_language: str) -> str:
+        """
+        Static prompt prefix for a language, built once and reused.
+        
+        Args:
+            detected_language: ISO 639-1 language code
+        
+        Returns:
+            Persona, guidelines and language instruction
+        """
+        prefix = self._prompt_prefixes.get(detected_language)
+        if prefix is None:
+            prefix = _PROMPT_PREFIX_TEMPLATE.format(
+                language_instruction=self._lang_instr.get(detected_language, self._lang_instr_default)
+            ).strip()
+            self._prompt_prefixes[detected_language] = prefix
+        return prefix
+    
+    @staticmethod
+    def _to_messages(system_prompt: str, user_prompt: str):
+        """
+        Build the chat message list for an LLM call.
+        
+        Args:
+            system_prompt: Static part of the prompt, unchanged across calls
+            user_prompt: Per-request part of the prompt
+        
+        Returns:
+            ``[SystemMessage, HumanMessage]``, or the combined prompt string
+            when LangChain message classes are unavailable
+        """
+        if HumanMessage is None:
+            return system_prompt + "\n\n" + user_prompt
+        if SystemMessage is None:
+            return [HumanMessage(content=system_prompt + "\n\n" + user_prompt)]
+        return [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+    
+    def _format_messages(self, source_docs: List[Document], question: str, detected_language: str):
+        """
+        Format the LLM prompt as a cacheable static prefix plus a dynamic suffix.
+        
+        Args:
+            source_docs: Retrieved documents used as grounding context
+            question: User's question
+            detected_language: ISO 639-1 language code
+        
+        Returns:
+            Chat messages (or a prompt string) for ``llm.invoke``
+        """
+        context = "\n\n".join([doc.page_content for doc in source_docs])
+        suffix = _PROMPT_SUFFIX_TEMPLATE.format(context=context, question=question).strip()
+        return self._to_messages(self._prompt_prefix(detected_language), suffix)
+    
+    async def astream_answer(self, question: str, detected_language: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream an answer sentence-by-sentence as the LLM generates it.
+        
+        Retrieval and safety checks run up front; when no LLM is configured
+        (or no documents are found) the complete answer is yielded at once.
+        Generated text is held back until a sentence ends, then passed
+        through the safety filter and language formatting before it is
+        yielded, so nothing reaches the client unfiltered.
+        
+        Args:
+            question: User's question in any supported language
+            detected_language: Pre-detected language (optional)
+        
+        Yields:
+            Filtered answer text in generation order
+        """
+        # Detection, retrieval and the blocking fallback run on the I/O pool
+        # so other requests on the event loop keep being served meanwhile
+        loop = asyncio.get_running_loop()
+        io_pool = getattr(self, '_io_pool', None)
+        
+        if self.llm is None:
+            # Nothing to stream; reuse the blocking path for a complete answer
+            result = await loop.run_in_executor(io_pool, self.answer_question, question, detected_language, False)
+            yield result.answer
+            return
+        
+        safety_warning = self.safety_filter.is_prohibited_topic(question)
+        if safety_warning:
+            logger.warning(f"Prohibited topic detected: {question[:50]}...")
+            yield safety_warning
+            return
+        
+        # Retrieval overlaps with language detection
+        retrieval = loop.run_in_executor(io_pool, self.get_relevant_documents, question)
+        if detected_language is None:
+            detected_language = await loop.run_in_executor(io_pool, self.language_detector.detect_language, question)
+        source_docs = await retrieval
+        
+        if not source_docs:
+            result = await loop.run_in_executor(io_pool, self.answer_question, question, detected_language, False)
+            yield result.answer
+            return
+        
+        messages = self._format_messages(source_docs, question, detected_language)
+        
+        generated = []
+        delivered = []
+        pending = ""
+        try:
+            async for chunk in self.llm.astream(messages):
+                if not chunk.content:
+                    continue
+                generated.append(chunk.content)
+                pending += chunk.content
+                cut = 0
+                for match in _SENTENCE_END_RE.finditer(pending):
+                    cut = match.end()
+                if cut:
+                    text = self._filter_streamed(pending[:cut], detected_language, not delivered)
+                    pending = pending[cut:]
+                    if text:
+                        delivered.append(text)
+                        yield text
+        except Exception as e:
+            logger.error(f"LLM streaming failed: {e}. Falling back to retrieved context.")
+            if not generated:
+                answer = self._generate_answer_from_docs(source_docs, detected_language)
+                yield format_multilingual_response(self.safety_filter.sanitize_response(answer), detected_language)
+                return
+        
+        text = self._filter_streamed(pending, detected_language, not delivered).rstrip()
+        if text:
+            delivered.append(text)
+            yield text
+        
+        # The disclaimer depends on the whole answer, so it can only follow it
+        answer = "".join(delivered)
+        if len(answer) < 50 or SafetyFilter._UNCERTAIN_RE.search("".join(generated)):
+            yield SafetyFilter.DISCLAIMER
+    
+    def _filter_streamed(self, text: str, language: str, first: bool) -> str:
+        """
+        Apply the safety filter and format_multilingual_response's Unicode
+        normalization to streamed sentences, keeping the spacing between them.
+        """
+        if first:
+            text = text.lstrip()
+        text = self.safety_filter.remove_divine_claims(text)
+        if language in ("hi", "te", "kn") and not text.isascii() and not unicodedata.is_normalized("NFC", text):
+            text = unicodedata.normalize("NFC", text)
+        return text
+    
+    def _prepare_question(
+        self,
+        question: str,
+        detected_language: Optional[str] = None,
+        include_sources: bool = True,
+        retrieve: bool = True
+    ) -> Dict[str, any]:
+        """
+        Run every step that precedes answer generation: language detection,
+        safety check, cache lookup and retrieval.
+        
+        Args:
+            question: User's question in any supported language
+            detected_language: Pre-detected language (optional)
+            include_sources: Whether to build source previews for the result
+            retrieve: Whether to retrieve documents here (the batch path
+                retrieves for all questions at once instead)
+        
+        Returns:
+            Dictionary with the detected language and either a final
+            ``result`` (refusal or cache hit) or the retrieved ``source_docs``
+        """
+        _request_logger.info("Processing question: {}...", question[:100])
+        
+        # Lowercase once and share with every check on the request path
+        question_lower = question.lower()
+        
+        # Safety check first: it is language independent, and a refused
+        # question should not start any retrieval work
+        safety_warning = self.safety_filter.is_prohibited_topic(question, question_lower)
+        
+        # Start retrieval on the I/O pool so it overlaps with language
+        # detection and the cache lookup on this thread
+        retrieval = None
+        retrieval_cancelled = threading.Event()
+        io_pool = getattr(self, '_io_pool', None)
+        if retrieve and not safety_warning and io_pool is not None:
+            retrieval = io_pool.submit(self._retrieve, question, retrieval_cancelled)
+        
+        # Detect language if not provided
+        if detected_language is None:
+            detected_language = self.language_detector.detect_language(question)
+        
+        _request_logger.opt(lazy=True).info(
+            "Question language: {}", lambda: self.language_detector.get_language_name(detected_language)
+        )
+        
+        prepared = {
+            "question": question,
+            "language": detected_language,
+            "include_sources": include_sources,
+            "result": None,
+            "source_docs": [],
+            "cache_key": None,
+            "query_embedding": None,
+        }
+        
+        if safety_warning:
+            logger.warning(f"Prohibited topic detected: {question[:50]}...")
+            prepared["result"] = QAResult(
+                answer=safety_warning,
+                language=detected_language,
+                is_safe=False
+            )
+            return prepared
+        
+        # Serve repeated (or near-identical) questions from the cache
+        response_cache = getattr(self, 'response_cache', None)
+        if response_cache is not None and response_cache.enabled:
+            cache_key = response_cache.make_key(question_lower, detected_language, include_sources)
+            cached = response_cache.get(cache_key)
+            if cached is None and response_cache.semantic:
+                if retrieval is not None:
+                    prepared["query_embedding"], prepared["source_docs"] = retrieval.result()
+                else:
+                    prepared["query_embedding"] = self._embed_question(question)
+                cached = response_cache.get_similar(cache_key, prepared["query_embedding"])
+            if cached is not None:
+                _request_logger.info("Answer served from response cache")
+                if retrieval is not None:
+                    # A queued job never starts; a running one skips the search
+                    retrieval_cancelled.set()
+                    retrieval.cancel()
+                prepared["result"] = cached
+                return prepared
+            prepared["cache_key"] = cache_key
+        
+        # Retrieve relevant documents
+        if retrieval is not None:
+            prepared["query_embedding"], prepared["source_docs"] = retrieval.result()
+        elif retrieve:
+            prepared["source_docs"] = self.get_relevant_documents(question, prepared["query_embedding"])
+        return prepared
+    
+    def _invoke_llm(self, source_docs: List[Document], question: str, detected_language: str) -> Tuple[str, Optional[str]]:
+        """
+        Generate an answer with the LLM, falling back to the retrieved context.
+        
+        Returns:
+            Tuple of (answer, llm_error) where llm_error is None on success
+        """
+        # Only build the (context-sized) prompt when an LLM will read it
+        messages = self._format_messages(source_docs, question, detected_language)
+        
+        llm_cache = getattr(self, '_llm_cache', None)
+        cache_key = None
+        if llm_cache is not None:
+            prompt = messages if isinstance(messages, str) else "\n\n".join(m.content for m in messages)
+            cache_key = self._llm_cache_key(prompt)
+            try:
+                cached = llm_cache.get(cache_key)
+            except Exception as e:
+                logger.warning(f"LLM answer cache read failed: {e}")
+                cached = None
+            if cached is not None:
+                _request_logger.info("Answer served from LLM answer cache")
+                return cached, None
+        
+        try:
+            response = self.llm.invoke(messages)
+            answer = response.content
+        except Exception as e:
+            try:
+                language_instruction = self._lang_instr.get(detected_language, self._lang_instr_default)
+                formatted_prompt = self._format_prompt(source_docs, question, language_instruction)
+                response = self.llm.invoke(formatted_prompt)
+                answer = response.content if hasattr(response, 'content') else str(response)
+            except Exception as e2:
+                logger.error(f"LLM generation failed: {e2}. Falling back to retrieved context.")
+                # Fallback to RAG-only generation using retrieved docs
+                answer = self._generate_answer_from_docs(source_docs, detected_language)
+                return answer, f"LLM generation failed: {str(e2)}"
+        
+        if cache_key is not None and answer:
+            try:
+                llm_cache.set(cache_key, answer, expire=settings.llm_cache_ttl_hours * 3600)
+            except Exception as e:
+                logger.warning(f"LLM answer cache write failed: {e}")
+        return answer, None
+    
+    def _no_info_answer(self, detected_language: str) -> str:
+        """Localized answer used when retrieval finds nothing."""
+        logger.warning("No relevant documents found")
+        return _NO_INFO_MSGS.get(detected_language, _NO_INFO_MSGS["en"])
+    
+    def _build_result(self, prepared: Dict[str, any], answer: str, llm_error: Optional[str] = None) -> QAResult:
+        """
+        Sanitize and format a generated answer into a QAResult,
+        and store it in the response cache.
+        """
+        detected_language = prepared["language"]
+        source_docs = prepared["source_docs"]
+        
+        # Sanitize response
+        answer = self.safety_filter.sanitize_response(answer)
+        
+        # Format for language
+        answer = format_multilingual_response(answer, detected_language)
+        
+        # Extract source information (skipped when the caller doesn't need it)
+        if prepared["include_sources"]:
+            if settings.max_sources > 0:
+                source_docs = source_docs[:settings.max_sources]
+            sources = [None] * len(source_docs)
+            for i, doc in enumerate(source_docs):
+                content = doc.page_content
+                sources[i] = Source(
+                    content=content if len(content) <= 200 else content[:200] + "...",
+                    metadata=doc.metadata
+                )
+            sources = tuple(sources)
+        else:
+            sources = ()
+        
+        _request_logger.success("Question answered successfully in {}", detected_language)
+        result = QAResult(
+            answer=answer,
+            language=detected_language,
+            sources=sources,
+            error=llm_error or None
+        )
+        # Only cache answers grounded in retrieved documents: a no-info
+        # fallback may just mean the vector store was missing or still loading
+        if not llm_error and source_docs and prepared["cache_key"] is not None:
+            self.response_cache.put(prepared["cache_key"], result, prepared["query_embedding"])
+        return result
+    
+    def _error_result(self, error: Exception, detected_language: Optional[str]) -> QAResult:
+        """Localized error result returned when answering fails."""
+        logger.error(f"Error answering question: {str(error)}")
+        
+        lang = detected_language if detected_language else "en"
+        
+        return QAResult(
+            answer=_ERROR_MSGS.get(lang, _ERROR_MSGS["en"]),
+            language=lang,
+            error=str(error)
+        )
+    
+    def answer_question(
+        self,
+        question: str,
+        detected_language: Optional[str] = None,
+        include_sources: bool = True
+    ) -> QAResult:
         """
         Answer a question using multilingual RAG with safety checks.
         
         Args:
             question: User's question in any supported language
             detected_language: Pre-detected language (optional)
+            include_sources: Whether to build source previews for the result
         
         Returns:
-            Dictionary containing answer, language, and metadata
+            QAResult with answer, language, sources and safety flag
+            (``to_dict()`` gives the JSON form)
         """
         try:
-            logger.info(f"Processing question: {question[:100]}...")
-            
-            # Detect language if not provided
-            if detected_language is None:
-                detected_language = self.language_detector.detect_language(question)
-            
-            logger.info(f"Question language: {self.language_detector.get_language_name(detected_language)}")
-            
-            # Safety check for prohibited topics
-            safety_warning = self.safety_filter.is_prohibited_topic(question)
-            if safety_warning:
-                logger.warning(f"Prohibited topic detected: {question[:50]}...")
-                return {
-                    "answer": safety_warning,
-                    "language": detected_language,
-                    "sources": [],
-                    "is_safe": False
-                }
-            
-            # Get language-specific instruction
-            language_instruction = get_language_specific_prompt(detected_language)
-            
-            # Retrieve relevant documents
-            source_docs = self.get_relevant_documents(question)
+            prepared = self._prepare_question(question, detected_language, include_sources)
+            detected_language = prepared["language"]
+            if prepared["result"] is not None:
+                return prepared["result"]
             
+            source_docs = prepared["source_docs"]
+            llm_error = None
             if not source_docs:
-                logger.warning("No relevant documents found")
-                no_info_responses = {
-                    "en": "This guidance is not available in Sai Baba's teachings.",
-                    "hi": "यह मार्गदर्शन साईं बाबा की शिक्षाओं में उपलब्ध नहीं है।",
-                    "te": "ఈ మార్గదర్శకత్వం సాయి బాబా బోధలలో అందుబాటులో లేదు।",
-                    "kn": "ಈ ಮಾರ್ಗದರ್ಶನವು ಸಾಯಿಬಾಬಾ ಅವರ ಬೋಧನೆಗಳಲ್ಲಿ ಲಭ್ಯವಿಲ್ಲ."
-                }
-                answer = no_info_responses.get(detected_language, no_info_responses["en"])
+                answer = self._no_info_answer(detected_language)
+            elif self.llm is None:
+                # RAG-only mode: produce a devotional 1-2 paragraph answer from retrieved docs
+                answer = self._generate_answer_from_docs(source_docs, detected_language)
             else:
-                # Format context from retrieved documents
-                context = "\n\n".join([doc.page_content for doc in source_docs])
-                
-                # Create the prompt
-                prompt = self._create_prompt_template()
-                formatted_prompt = prompt.format(
-                    context=context,
-                    question=question,
-                    language_instruction=language_instruction
-                )
-                
-                # Generate answer using LLM if available; otherwise produce RAG-only answer
-                llm_error = None
-                if self.llm is None:
-                    # RAG-only mode: produce a devotional 1-2 paragraph answer from retrieved docs
-                    answer = self._generate_answer_from_docs(source_docs, detected_language)
-                else:
-                    try:
-                        from langchain_core.messages import HumanMessage
-                        response = self.llm.invoke([HumanMessage(content=formatted_prompt)])
-                        answer = response.content
-                    except Exception as e:
-                        try:
-                            response = self.llm.invoke(formatted_prompt)
-                            answer = response.content if hasattr(response, 'content') else str(response)
-                        except Exception as e2:
-                            llm_error = f"LLM generation failed: {str(e2)}"
-                            logger.error(f"LLM generation failed: {e2}. Falling back to retrieved context.")
-                            # Fallback to RAG-only generation using retrieved docs
-                            answer = self._generate_answer_from_docs(source_docs, detected_language)
+                answer, llm_error = self._invoke_llm(source_docs, question, detected_language)
             
-            # Sanitize response
-            answer = self.safety_filter.sanitize_response(answer)
+            return self._build_result(prepared, answer, llm_error)
             
-            # Format for language
-            answer = format_multilingual_response(answer, detected_language)
+        except Exception as e:
+            return self._error_result(e, detected_language)
+    
+    async def answer_question_async(
+        self,
+        question: str,
+        detected_language: Optional[str] = None,
+        include_sources: bool = True
+    ) -> QAResult:
+        """
+        Answer a question, micro-batching concurrent LLM requests.
+        
+        Questions arriving within LLM_BATCH_WAIT_MS of each other are packed
+        (up to LLM_BATCH_SIZE) into a single batch prompt. Without an LLM
+        this simply runs `answer_question` in a worker thread.
+        
+        Args:
+            question: User's question in any supported language
+            detected_language: Pre-detected language (optional)
+            include_sources: Whether to build source previews for the result
+        
+        Returns:
+            QAResult with answer, language, sources and safety flag
+        """
+        if self.llm is None or settings.llm_batch_size <= 1:
+            return await asyncio.to_thread(self.answer_question, question, detected_language, include_sources)
+        
+        loop = asyncio.get_running_loop()
+        if getattr(self, '_batch_loop', None) is not loop:
+            # (Re)start the batching worker on the caller's event loop
+            self._batch_loop = loop
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = loop.create_task(self._batch_worker(self._batch_queue))
+        
+        future = loop.create_future()
+        await self._batch_queue.put((question, detected_language, include_sources, future))
+        return await future
+    
+    async def _batch_worker(self, queue: "asyncio.Queue") -> None:
+        """Drain the queue into batches of up to LLM_BATCH_SIZE questions."""
+        loop = asyncio.get_running_loop()
+        wait = settings.llm_batch_wait_ms / 1000.0
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + wait
+            while len(batch) < settings.llm_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
             
-            # Extract source information
-            sources = []
-            for doc in source_docs:
-                source_info = {
-                    "content": doc.page_content[:200] + "...",
-                    "metadata": doc.metadata
+            try:
+                await self._answer_batch(batch)
+            except Exception as e:
+                logger.error(f"Batch answering failed: {e}")
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    async def _answer_batch(self, batch: List[tuple]) -> None:
+        """Answer a batch of queued questions and resolve their futures."""
+        loop = asyncio.get_running_loop()
+        
+        # Language detection, safety and cache checks run per question on the I/O pool
+        prepared_list = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._io_pool, self._prepare_question, question, language, include_sources, False
+                )
+                for question, language, include_sources, _ in batch
+            ),
+            return_exceptions=True
+        )
+        
+        # Retrieval for the whole batch: one embed pass and one index.search
+        to_retrieve = [
+            prepared for prepared in prepared_list
+            if not isinstance(prepared, Exception) and prepared["result"] is None
+        ]
+        if to_retrieve:
+            try:
+                docs_per_question = await loop.run_in_executor(
+                    self._io_pool,
+                    self.get_relevant_documents_batch,
+                    [prepared["question"] for prepared in to_retrieve],
+                    [prepared["query_embedding"] for prepared in to_retrieve],
+                )
+                for prepared, docs in zip(to_retrieve, docs_per_question):
+                    prepared["source_docs"] = docs
+            except Exception as e:
+                logger.error(f"Batch retrieval failed: {e}")
+        
+        pending = []
+        for (question, language, _, future), prepared in zip(batch, prepared_list):
+            if isinstance(prepared, Exception):
+                result = self._error_result(prepared, language)
+            elif prepared["result"] is not None:
+                result = prepared["result"]
+            elif not prepared["source_docs"]:
+                result = self._build_result(prepared, self._no_info_answer(prepared["language"]))
+            else:
+                pending.append((future, prepared))
+                continue
+            if not future.done():
+                future.set_result(result)
+        
+        if not pending:
+            return
+        
+        answers = {}
+        if len(pending) > 1:
+            answers = await self._ainvoke_batch([prepared for _, prepared in pending])
+        
+        for i, (future, prepared) in enumerate(pending):
+            try:
+                if i in answers:
+                    result = self._build_result(prepared, answers[i])
+                else:
+                    # Single question, or missing from the batch response
+                    answer, llm_error = await asyncio.to_thread(
+                        self._invoke_llm, prepared["source_docs"], prepared["question"], prepared["language"]
+                    )
+                    result = self._build_result(prepared, answer, llm_error)
+            except Exception as e:
+                result = self._error_result(e, prepared["language"])
+            if not future.done():
+                future.set_result(result)
+    
+    async def _ainvoke_batch(self, prepared_list: List[Dict[str, any]]) -> Dict[int, str]:
+        """
+        Answer several questions with one batch prompt.
+        
+        Returns:
+            Mapping of batch position to answer for every answer that could be
+            parsed from the response; missing positions should be retried alone.
+        """
+        sections = []
+        for i, prepared in enumerate(prepared_list, 1):
+            context = "\n\n".join([doc.page_content for doc in prepared["source_docs"]])
+            sections.append(_BATCH_QUESTION_TEMPLATE.format(
+                index=i,
+                language_instruction=self._lang_instr.get(prepared["language"], self._lang_instr_default),
+                context=context,
+                question=prepared["question"]
+            ))
+        batch_prompt = _BATCH_PROMPT_TEMPLATE.format(questions="\n".join(sections))
+        
+        try:
+            response = await self.llm.ainvoke(self._to_messages(_PROMPT_GUIDELINES, batch_prompt))
+            content = response.content if hasattr(response, 'content') else str(response)
+        except Exception as e:
+            logger.error(f"Batch LLM generation failed: {e}. Answering questions individually.")
+            return {}
+        
+        answers = {}
+        for match in _BATCH_ANSWER_RE.finditer(content):
+            index = int(match.group(1)) - 1
+            answer = match.group(2).strip()
+            if 0 <= index < len(prepared_list) and answer:
+                answers[index] = answer
+        _request_logger.info("Answered {}/{} questions from one batch prompt", len(answers), len(prepared_list))
+        return answers
+    
+    # Seconds a deep validation result stays fresh
+    VALIDATION_TTL_SECONDS = 60
+    
+    def health(self) -> Dict[str, any]:
+        """
+        Shallow health check: vector store size and a single retrieval.
+        Cheap enough for frequent health probes (no LLM call).
+        
+        Returns:
+            Dictionary with health results
+        """
+        try:
+            if not getattr(self, 'vector_store', None):
+                return {
+                    "vector_store_size": None,
+                    "retrieval_working": False,
+                    "llm_provider": settings.ai_provider if settings.use_llm else None,
+                    "status": "degraded"
                 }
-                sources.append(source_info)
-            
-            logger.success(f"Question answered successfully in {detected_language}")
-            result = {
-                "answer": answer,
-                "language": detected_language,
-                "sources": sources,
-                "is_safe": True
-            }
-            if 'llm_error' in locals() and llm_error:
-                result["error"] = llm_error
-            return result
             
-        except Exception as e:
-            logger.error(f"Error answering question: {str(e)}")
+            index_size = self.vector_store.index.ntotal
+            test_docs = self.get_relevant_documents("What is devotion?")
             
-            # Error messages in detected language
-            error_messages = {
-                "en": "I apologize, but I encountered an error while processing your question. Please try rephrasing your question or try again later.",
-                "hi": "क्षमा करें, आपके प्रश्न को संसाधित करते समय एक त्रुटि हुई। कृपया अपना प्रश्न दोबारा लिखें या बाद में पुनः प्रयास करें।",
-                "te": "క్షమించండి, మీ ప్రశ్నను ప్రాసెస్ చేయడంలో లోపం ఏర్పడింది. దయచేసి మీ ప్రశ్నను తిరిగి వ్రాయండి లేదా తర్వాత మళ్లీ ప్రయత్నించండి।",
-                "kn": "ಕ್ಷಮಿಸಿ, ನಿಮ್ಮ ಪ್ರಶ್ನೆಯನ್ನು ಪ್ರಕ್ರಿಯೆಗೊಳಿಸುವಲ್ಲಿ ದೋಷ ಎದುರಾಗಿದೆ. ದಯವಿಟ್ಟು ನಿಮ್ಮ ಪ್ರಶ್ನೆಯನ್ನು ಪುನಃ ಬರೆಯಿರಿ ಅಥವಾ ನಂತರ ಮತ್ತೆ ಪ್ರಯತ್ನಿಸಿ."
+            return {
+                "vector_store_size": index_size,
+                "retrieval_working": len(test_docs) > 0,
+                "llm_provider": settings.ai_provider if settings.use_llm else None,
+                "status": "healthy" if index_size > 0 and test_docs else "degraded"
             }
-            
-            lang = detected_language if detected_language else "en"
-            
+        except Exception as e:
+            logger.error(f"Health check failed: {str(e)}")
             return {
-                "answer": error_messages.get(lang, error_messages["en"]),
-                "language": lang,
-                "sources": [],
-                "is_safe": True,
+                "status": "unhealthy",
                 "error": str(e)
             }
     
-    def validate_system(self) -> Dict[str, any]:
+    def deep_validate(self) -> Dict[str, any]:
         """
-        Validate that the RAG system is working correctly.
+        Validate that the RAG system is working correctly, including a full
+        answer generation (LLM call when enabled).
         
         Returns:
             Dictionary with validation results
@@ -548,12 +1560,12 @@ Answer:
             test_docs = self.get_relevant_documents("What is devotion?")
 
             # Test answer generation
-            test_result = self.answer_question("What is the importance of faith?")
+            test_result = self.answer_question("What is the importance of faith?", include_sources=False)
 
             validation = {
                 "vector_store_size": index_size,
                 "retrieval_working": len(test_docs) > 0,
-                "answer_generation_working": len(test_result["answer"]) > 0,
+                "answer_generation_working": len(test_result.answer) > 0,
                 "llm_provider": settings.ai_provider if settings.use_llm else None,
                 "status": "healthy"
             }
@@ -567,6 +1579,29 @@ Answer:
                 "status": "unhealthy",
                 "error": str(e)
             }
+    
+    def validate_system(self) -> Dict[str, any]:
+        """
+        Validate the RAG system, reusing a recent deep validation result
+        for up to VALIDATION_TTL_SECONDS to avoid repeated LLM calls.
+        
+        Returns:
+            Dictionary with validation results
+        """
+        checked_at, cached = getattr(self, '_last_validation', (0.0, {}))
+        if cached and time.time() - checked_at < self.VALIDATION_TTL_SECONDS:
+            return cached
+        
+        validation = self.deep_validate()
+        if validation.get("status") != "unhealthy":
+            self._last_validation = (time.time(), validation)
+        return validation
+
+
+async def _print_stream(engine: MultilingualRAGEngine, question: str) -> None:
+    """Print a streamed answer chunk-by-chunk without newlines."""
+    async for chunk in engine.astream_answer(question):
+        print(chunk, end="", flush=True)
 
 
 def main():
@@ -597,12 +1632,19 @@ def main():
             if not question:
                 continue
             
+            if engine.llm is not None:
+                # Stream tokens to the terminal as they are generated
+                print("\nAnswer: ", end="", flush=True)
+                asyncio.run(_print_stream(engine, question))
+                print()
+                continue
+            
             result = engine.answer_question(question)
-            print(f"\nLanguage: {result.get('language', 'unknown')}")
-            print(f"Answer: {result['answer']}")
+            print(f"\nLanguage: {result.language}")
+            print(f"Answer: {result.answer}")
             
-            if result.get('sources'):
-                print(f"\n(Based on {len(result['sources'])} source(s))")
+            if result.sources:
+                print(f"\n(Based on {len(result.sources)} source(s))")
         
         logger.info("Multilingual RAG engine test completed")
         
@@ -5,17 +5,34 @@ passages from the existing FAISS vector DB (no LLM). Designed to be
 lightweight and safe for local deployment.
 """
 
-from typing import Optional, List, Dict
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Optional, List, Dict
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict
 from loguru import logger
 
 from config import settings
+import logger_config  # noqa: F401  (configures queued, sampled loguru handlers)
 from ingest import DataIngestionPipeline
-from ask import SimpleChatbot
+from cache import open_query_cache
 
 
-app = FastAPI(title="Sai Baba — Retrieval Chatbot", version="0.1")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the embedding model, index (and LLM engine) before serving."""
+    if settings.warmup_on_startup:
+        await asyncio.to_thread(warmup)
+    yield
+
+
+app = FastAPI(title="Sai Baba — Retrieval Chatbot", version="0.1", lifespan=lifespan)
+if settings.gzip_minimum_size > 0:
+    app.add_middleware(
+        GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_compress_level
+    )
 
 
 # Lazy-loaded pipeline and vector store
@@ -23,11 +40,29 @@ _pipeline: Optional[DataIngestionPipeline] = None
 _vector_store = None
 _rag_engine = None
 _chatbot = None
+_query_cache = None
+_query_cache_opened = False
+# Serialize first-time loads: requests run these getters via asyncio.to_thread,
+# and a burst of first requests must not each load the model and index
+_pipeline_lock = threading.Lock()
+_vector_store_lock = threading.Lock()
+_query_cache_lock = threading.Lock()
+
+# Search batching state, bound to the event loop that serves requests
+_search_loop = None
+_search_queue = None
+_search_task = None
+
+# Answers being computed, keyed by (requested language, question), so
+# concurrent identical questions share one retrieval/LLM call
+_inflight: Dict[tuple, asyncio.Task] = {}
 
 
-def get_simple_chatbot() -> SimpleChatbot:
+def get_simple_chatbot():
     global _chatbot
     if _chatbot is None:
+        # Import here so the retrieval-only path never loads the chatbot module
+        from ask import SimpleChatbot
         _chatbot = SimpleChatbot()
     return _chatbot
 
@@ -35,20 +70,87 @@ def get_simple_chatbot() -> SimpleChatbot:
 def get_pipeline() -> DataIngestionPipeline:
     global _pipeline
     if _pipeline is None:
-        logger.info("Initializing data pipeline (embeddings will load)...")
-        _pipeline = DataIngestionPipeline()
-        logger.success("Pipeline initialized")
+        with _pipeline_lock:
+            if _pipeline is None:
+                logger.info("Initializing data pipeline (embeddings will load)...")
+                _pipeline = DataIngestionPipeline()
+                logger.success("Pipeline initialized")
     return _pipeline
 
 
 def get_vector_store():
     global _vector_store
     if _vector_store is None:
-        pipeline = get_pipeline()
-        _vector_store = pipeline.load_vector_store()
+        with _vector_store_lock:
+            if _vector_store is None:
+                pipeline = get_pipeline()
+                _vector_store = pipeline.load_vector_store()
     return _vector_store
 
 
+def warmup() -> None:
+    """Load everything the first request would, and run one throwaway search
+    to page in the (memory-mapped) index and the model's first forward pass."""
+    vs = get_vector_store()
+    if vs is not None:
+        try:
+            vs.similarity_search("warmup", k=1)
+        except Exception as e:
+            logger.warning(f"Warmup search failed: {e}")
+    get_query_cache()
+    get_rag_engine()
+    logger.success("Warmup complete")
+
+
+def get_query_cache():
+    """Lazily open the persistent query cache (None when disabled)."""
+    global _query_cache, _query_cache_opened
+    if not _query_cache_opened:
+        with _query_cache_lock:
+            if not _query_cache_opened:
+                _query_cache = open_query_cache(settings.query_cache_path, get_pipeline().model_name)
+                _query_cache_opened = True
+    return _query_cache
+
+
+def search_many(vs, questions: List[str], k: int) -> List[list]:
+    """
+    Search several questions, reusing cached embeddings and hits.
+
+    Questions seen before (with the same index and k) are answered from their
+    cached FAISS row ids; the rest are embedded in one pass (cached vectors
+    skip the model) and searched with one `index.search` call.
+
+    Args:
+        vs: Vector store (FaissWrapper)
+        questions: Question texts
+        k: Number of documents per question
+
+    Returns:
+        Document lists aligned with ``questions``
+    """
+    cache = get_query_cache()
+    if cache is None or not hasattr(vs, "search_ids"):
+        return vs.similarity_search_batch(questions, k)
+
+    results: List[Optional[list]] = [None] * len(questions)
+    pending = []
+    for i, question in enumerate(questions):
+        ids = cache.get_hits(question, k, vs.version)
+        if ids is not None:
+            results[i] = vs.docs_for_ids(ids)
+        else:
+            pending.append(i)
+
+    if pending:
+        texts = [questions[i] for i in pending]
+        embeddings = cache.get_or_embed_many(texts, vs.embed_queries)
+        for i, text, ids in zip(pending, texts, vs.search_ids(embeddings, k)):
+            cache.put_hits(text, k, vs.version, ids)
+            results[i] = vs.docs_for_ids(ids)
+    return results
+
+
 def get_rag_engine():
     """Lazily initialize the MultilingualRAGEngine if LLM mode is enabled."""
     global _rag_engine
@@ -67,6 +169,78 @@ def get_rag_engine():
     return _rag_engine
 
 
+async def batched_similarity_search(vs, question: str, k: int):
+    """
+    Similarity search that coalesces concurrent requests into one FAISS query.
+    
+    Requests arriving within SEARCH_BATCH_WAIT_MS of each other (up to
+    SEARCH_BATCH_SIZE) are embedded in one forward pass and searched with a
+    single `index.search` call.
+    
+    Args:
+        vs: Vector store (FaissWrapper)
+        question: User's question
+        k: Number of documents to return
+    
+    Returns:
+        List of relevant documents
+    """
+    if not hasattr(vs, "similarity_search_batch"):
+        return await asyncio.to_thread(vs.similarity_search, question, k)
+    if settings.search_batch_size <= 1:
+        return (await asyncio.to_thread(search_many, vs, [question], k))[0]
+
+    global _search_loop, _search_queue, _search_task
+    loop = asyncio.get_running_loop()
+    if _search_loop is not loop:
+        # (Re)start the batching worker on the caller's event loop
+        _search_loop = loop
+        _search_queue = asyncio.Queue()
+        _search_task = loop.create_task(_search_worker(_search_queue))
+
+    future = loop.create_future()
+    await _search_queue.put((vs, question, k, future))
+    return await future
+
+
+async def _search_worker(queue: "asyncio.Queue") -> None:
+    """Drain queued searches into batches and resolve their futures."""
+    loop = asyncio.get_running_loop()
+    wait = settings.search_batch_wait_ms / 1000.0
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + wait
+        while len(batch) < settings.search_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # One search per (vector store, k) group; normally a single group
+        groups: Dict[tuple, tuple] = {}
+        for vs, question, k, future in batch:
+            groups.setdefault((id(vs), k), (vs, k, []))[2].append((question, future))
+
+        for vs, k, items in groups.values():
+            try:
+                results = await asyncio.to_thread(search_many, vs, [q for q, _ in items], k)
+                for (_, future), docs in zip(items, results):
+                    if not future.done():
+                        future.set_result(docs)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+        if len(batch) > 1:
+            logger.debug(f"Answered {len(batch)} searches with batched FAISS queries")
+
+
 class QuestionRequest(BaseModel):
     question: str
     language: Optional[str] = None
@@ -78,46 +252,105 @@ class SourceItem(BaseModel):
 
 
 class AnswerResponse(BaseModel):
+    # Frozen so the shared no-info responses below can be returned as-is
+    model_config = ConfigDict(frozen=True)
+
     answer: str
     language: str
     sources: List[SourceItem]
 
 
+_NO_INFO = {
+    "en": "This guidance is not available in the provided documents.",
+    "hi": "यह मार्गदर्शन दिए गए दस्तावेज़ों में उपलब्ध नहीं है।",
+}
+_EMPTY_ANSWERS = {
+    lang: AnswerResponse(answer=message, language=lang, sources=[]) for lang, message in _NO_INFO.items()
+}
+
+
 @app.get("/health")
-def health():
+def health() -> Dict[str, Any]:
     vs = get_vector_store()
     return {
         "status": "healthy" if vs is not None else "vector_db_missing",
         "engine": "retrieval-only",
         "vector_db_present": vs is not None,
         "vector_db_path": settings.vector_db_path,
+        "index_mmap": getattr(vs, "mmapped", False),
+    }
+
+
+@app.get("/config")
+def config_info() -> Dict[str, Any]:
+    """Return retrieval configuration, including the index's recall/latency tradeoff."""
+    vs = _vector_store
+    return {
+        "top_k_results": settings.top_k_results,
+        "search_batch_size": settings.search_batch_size,
+        "query_cache": bool(settings.query_cache_path),
+        "index": vs.describe() if vs is not None and hasattr(vs, "describe") else None,
     }
 
 
 @app.post("/ask", response_model=AnswerResponse)
-def ask(request: QuestionRequest):
+async def ask(request: QuestionRequest):
     q = (request.question or "").strip()
     if not q:
         raise HTTPException(status_code=400, detail="Question cannot be empty")
 
-    vs = get_vector_store()
+    key = (request.language, q)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(compute_answer(q, request.language))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    # Shielded so one caller disconnecting does not cancel the shared answer;
+    # errors (including HTTPException) reach every caller
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(key: tuple, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Mark the exception as retrieved even if every caller went away
+        task.exception()
+
+
+async def compute_answer(q: str, language: Optional[str]) -> AnswerResponse:
+    """
+    Answer a question with the RAG engine, falling back to retrieval-only.
+
+    Args:
+        q: Stripped, non-empty question
+        language: Requested language code (None to auto-detect)
+
+    Returns:
+        AnswerResponse
+    """
+    lang = language or settings.default_language
+
+    # Blocking work (model loading, embedding, FAISS search) runs in worker
+    # threads so the event loop keeps serving other requests
+    vs = await asyncio.to_thread(get_vector_store)
     if settings.use_llm:
         # Try RAG+LLM path first when enabled
-        rag = get_rag_engine()
+        rag = await asyncio.to_thread(get_rag_engine)
         if rag is not None:
             try:
-                result = rag.answer_question(q, request.language)
+                result = await rag.answer_question_async(q, language)
                 answer = result.get("answer", "")
-                language = result.get("language", request.language or settings.default_language)
+                language = result.get("language", lang)
                 sources_raw = result.get("sources", [])
                 sources = []
                 for s in sources_raw:
                     content = s.get("content") or s.get("excerpt") or ""
                     excerpt = (content[:400] + "...") if len(content) > 400 else content
-                    meta = s.get("metadata") or {}
-                    safe_meta = {k: str(v) for k, v in meta.items()}
-                    sources.append(SourceItem(excerpt=excerpt, metadata=safe_meta))
-                return AnswerResponse(answer=answer, language=language, sources=sources)
+                    # Metadata values are coerced to str when the vector store loads
+                    safe_meta = s.get("metadata") or {}
+                    sources.append(SourceItem.model_construct(excerpt=excerpt, metadata=safe_meta))
+                return AnswerResponse.model_construct(answer=answer, language=language, sources=sources)
             except Exception as e:
                 logger.error(f"RAG engine failed to answer: {e}. Falling back to retrieval-only.")
                 # fall through to retrieval-only
@@ -132,36 +365,36 @@ def ask(request: QuestionRequest):
         )
 
     try:
-        docs = vs.similarity_search(q, k=settings.top_k_results)
+        docs = await batched_similarity_search(vs, q, settings.top_k_results)
     except Exception as e:
         logger.error(f"Error during similarity search: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail="Search failed")
 
     if not docs:
-        no_info = {
-            "en": "This guidance is not available in the provided documents.",
-            "hi": "यह मार्गदर्शन दिए गए दस्तावेज़ों में उपलब्ध नहीं है।",
-        }
-        answer = no_info.get(request.language or settings.default_language, no_info["en"])
-        return AnswerResponse(answer=answer, language=request.language or settings.default_language, sources=[])
-
-    # Compose answer as concatenation of retrieved passages (you can change formatting)
-    passages = [d.page_content.strip() for d in docs]
-    answer_text = "\n\n---\n\n".join(passages)
-
+        empty = _EMPTY_ANSWERS.get(lang)
+        if empty is None:
+            empty = AnswerResponse(answer=_NO_INFO["en"], language=lang, sources=[])
+        return empty
+
+    # Compose answer as concatenation of retrieved passages (you can change formatting),
+    # building passages and source excerpts in a single pass over the documents
+    passages = []
     sources = []
     for d in docs:
-        excerpt = (d.page_content[:400] + "...") if len(d.page_content) > 400 else d.page_content
-        # Coerce metadata values to simple types (strings) for JSON/Pydantic safety
-        raw_meta = d.metadata or {}
-        safe_meta = {k: str(v) for k, v in raw_meta.items()}
-        sources.append(SourceItem(excerpt=excerpt, metadata=safe_meta))
+        pc = d.page_content
+        passages.append(pc.strip())
+        excerpt = (pc[:400] + "...") if len(pc) > 400 else pc
+        # Metadata values are coerced to str once, when the vector store loads
+        safe_meta = d.metadata or {}
+        # Server-built from trusted values, so skip per-field validation
+        sources.append(SourceItem.model_construct(excerpt=excerpt, metadata=safe_meta))
+    answer_text = "\n\n---\n\n".join(passages)
 
-    return AnswerResponse(answer=answer_text, language=request.language or settings.default_language, sources=sources)
+    return AnswerResponse.model_construct(answer=answer_text, language=lang, sources=sources)
 
 
 @app.post("/ask_simple", response_model=AnswerResponse)
-def ask_simple(request: QuestionRequest):
+async def ask_simple(request: QuestionRequest):
     """Return a concise multilingual answer using the simple chatbot (no vector DB / LLM)."""
     q = (request.question or "").strip()
     if not q:
@@ -169,23 +402,25 @@ def ask_simple(request: QuestionRequest):
 
     chatbot = get_simple_chatbot()
     try:
-        result = chatbot.ask(q, request.language)
+        result = await asyncio.to_thread(chatbot.ask, q, request.language)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Simple chatbot failed to answer: {e}")
+        raise HTTPException(status_code=500, detail="Failed to answer the question")
 
     # Map SimpleChatbot result into AnswerResponse
     sources = []
     for s in result.get("sources", []):
         content = s.get("content") if isinstance(s, dict) else str(s)
         excerpt = content if len(content) <= 400 else content[:400] + "..."
-        sources.append(SourceItem(excerpt=excerpt, metadata={}))
+        sources.append(SourceItem.model_construct(excerpt=excerpt, metadata={}))
 
-    return AnswerResponse(answer=result.get("answer", ""), language=result.get("language", settings.default_language), sources=sources)
+    return AnswerResponse.model_construct(
+        answer=result.get("answer", ""), language=result.get("language", settings.default_language), sources=sources
+    )
 
 
 if __name__ == "__main__":
-    import uvicorn
     import os
+    from api_entrypoint import run
 
-    port = int(os.environ.get("PORT", settings.api_port))
-    uvicorn.run(app, host=settings.api_host, port=port)
+    run("retrieval_api:app", settings.api_host, int(os.environ.get("PORT", settings.api_port)), app=app)
@@ -3,37 +3,60 @@
 Simple REST API for asking questions - runs on http://localhost:8000
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 from loguru import logger
+import asyncio
 import re
-from ask import SimpleChatbot
+from contextlib import asynccontextmanager
 from config import settings
-from rag_engine import MultilingualRAGEngine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the engine before serving instead of on the first request."""
+    if settings.warmup_on_startup:
+        await ensure_engine()
+    yield
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Sai Baba Guidance Chatbot",
     description="Ask questions about Sai Baba's spiritual teachings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Add CORS middleware for frontend access
+# Add CORS middleware for frontend access. With the wildcard origin the
+# middleware sends a static "*" header; credentials are only allowed for an
+# explicit origin list, since "*" with credentials means reflecting any Origin.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins in production use specific domains
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.cors_origins,
+    allow_credentials="*" not in settings.cors_origins,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
 )
 
+# Compress large answers (passages plus sources run to tens of KB)
+if settings.gzip_minimum_size > 0:
+    app.add_middleware(
+        GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_compress_level
+    )
+
 # Initialize backend engine based on settings
 engine_mode = "llm" if settings.use_llm else "simple"
-chatbot: Optional[SimpleChatbot] = None
-rag_engine: Optional[MultilingualRAGEngine] = None
+# Engines are imported lazily in get_engine(): the RAG engine pulls in
+# LangChain and the embedding stack, which "simple" mode never needs
+chatbot: Optional[Any] = None
+rag_engine: Optional[Any] = None
 engine_initialized = False
+# Serializes first-request initialization across concurrent async handlers
+_engine_lock = asyncio.Lock()
 
 def get_engine():
     """Lazy-load engine on first request to avoid blocking server startup."""
@@ -45,39 +68,53 @@ def get_engine():
     try:
         if settings.use_llm:
             logger.info("Initializing LLM engine...")
+            from rag_engine import MultilingualRAGEngine
             rag_engine = MultilingualRAGEngine()
             logger.success("LLM engine initialized")
         else:
             logger.info("Initializing simple chatbot...")
+            from ask import SimpleChatbot
             chatbot = SimpleChatbot()
             logger.success("Simple chatbot initialized")
     except Exception as e:
         logger.error(f"Engine initialization failed: {e}. Using simple fallback.")
         engine_mode = "simple"
+        from ask import SimpleChatbot
         chatbot = SimpleChatbot()
     
     engine_initialized = True
 
-# Configure logging to be minimal
-logger.remove()
+
+async def ensure_engine():
+    """Initialize the engine once, off the event loop, even under a burst of requests."""
+    if engine_initialized:
+        return
+    async with _engine_lock:
+        if not engine_initialized:
+            await asyncio.to_thread(get_engine)
 
 
-class QuestionRequest(BaseModel):
-    """Request model for asking questions"""
-    question: str
-    language: Optional[str] = None
+async def answer_with_engine(question: str, language: Optional[str]) -> dict:
+    """Answer with the configured engine without blocking the event loop."""
+    if engine_mode == "llm" and rag_engine is not None:
+        result = await rag_engine.answer_question_async(question, language)
+        return result.to_dict()
+    return await asyncio.to_thread(chatbot.ask, question, language)
+
+# Configure logging to be minimal
+logger.remove()
 
 
 class AnswerResponse(BaseModel):
     """Response model for answers"""
     answer: str
     language: str
-    sources: List[Dict[str, str]]
+    sources: List[Dict[str, Any]]
     is_safe: bool
 
 
 @app.get("/", tags=["Info"])
-def root():
+def root() -> Dict[str, Any]:
     """Welcome message"""
     return {
         "message": "Welcome to Sai Baba Guidance Chatbot",
@@ -95,7 +132,7 @@ def root():
 
 
 @app.get("/health", tags=["Info"])
-def health():
+def health() -> Dict[str, Any]:
     """Health check endpoint"""
     info = {
         "status": "healthy",
@@ -105,11 +142,13 @@ def health():
         "ai_provider": settings.ai_provider if settings.use_llm else None,
         "model_name": settings.model_name if settings.use_llm else None,
     }
+    if rag_engine is not None:
+        info["rag"] = rag_engine.health()
     return info
 
 
 @app.get("/config", tags=["Info"])
-def config_info():
+def config_info() -> Dict[str, Any]:
     """Return current AI configuration for verification."""
     return {
         "engine_mode": engine_mode,
@@ -123,7 +162,7 @@ def config_info():
 
 
 @app.post("/ask", response_model=AnswerResponse, tags=["Chat"])
-def ask_question(request: QuestionRequest):
+async def ask_question(question: str = Body(...), language: Optional[str] = Body(None)):
     """
     Ask a question about Sai Baba's teachings
     
@@ -137,30 +176,32 @@ def ask_question(request: QuestionRequest):
     - `sources`: Source references
     - `is_safe`: Whether the response passed safety checks
     """
+    # Body fields are validated individually; no request model is built
+    if not question or not question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+
     try:
-        get_engine()  # Initialize on first request
-        
-        if not request.question or not request.question.strip():
-            raise HTTPException(status_code=400, detail="Question cannot be empty")
+        await ensure_engine()  # Initialize on first request
         
-        if engine_mode == "llm" and rag_engine is not None:
-            result = rag_engine.answer_question(request.question, request.language)
-        else:
-            result = chatbot.ask(request.question, request.language)
+        result = await answer_with_engine(question, language)
 
         # Clean up whitespace/newlines in the final answer for nicer formatting
         answer = result.get("answer", "")
         answer = re.sub(r"\s+", " ", answer).strip()
         result["answer"] = answer
 
-        return AnswerResponse(**result)
+        # Server-built result; FastAPI serializes it via response_model
+        return AnswerResponse.model_construct(**result)
     
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Failed to answer question: {e}")
+        raise HTTPException(status_code=500, detail="Failed to answer the question")
 
 
 @app.get("/ask", response_model=AnswerResponse, tags=["Chat"])
-def ask_question_get(question: str, language: Optional[str] = None):
+async def ask_question_get(question: str, language: Optional[str] = None):
     """
     Ask a question via GET request
     
@@ -172,30 +213,31 @@ def ask_question_get(question: str, language: Optional[str] = None):
     - `/ask?question=What%20is%20devotion?`
     - `/ask?question=What%20is%20faith?&language=en`
     """
+    if not question or not question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+
     try:
-        get_engine()  # Initialize on first request
+        await ensure_engine()  # Initialize on first request
         
-        if not question or not question.strip():
-            raise HTTPException(status_code=400, detail="Question cannot be empty")
-        
-        if engine_mode == "llm" and rag_engine is not None:
-            result = rag_engine.answer_question(question, language)
-        else:
-            result = chatbot.ask(question, language)
+        result = await answer_with_engine(question, language)
 
         # Clean up whitespace/newlines in the final answer
         answer = result.get("answer", "")
         answer = re.sub(r"\s+", " ", answer).strip()
         result["answer"] = answer
 
-        return AnswerResponse(**result)
+        # Server-built result; FastAPI serializes it via response_model
+        return AnswerResponse.model_construct(**result)
     
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Failed to answer question: {e}")
+        raise HTTPException(status_code=500, detail="Failed to answer the question")
 
 
 @app.get("/languages", tags=["Info"])
-def get_supported_languages():
+def get_supported_languages() -> Dict[str, Any]:
     """Get list of supported languages"""
     return {
         "supported_languages": [
@@ -252,8 +294,8 @@ USAGE EXAMPLES:
 
 
 if __name__ == "__main__":
-    import uvicorn
     import os
+    from api_entrypoint import run
     
     print("\n" + "="*60)
     print("  Sai Baba Guidance Chatbot API")
@@ -265,4 +307,4 @@ if __name__ == "__main__":
     print("\n" + "="*60 + "\n")
     
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    run("simple_api:app", "0.0.0.0", port, app=app)
@@ -1,19 +1,70 @@
 """
-Multilingual Speech-to-Text conversion module using OpenAI Whisper.
+Multilingual Speech-to-Text conversion module using Whisper.
 Supports English, Hindi, Telugu, and Kannada audio transcription.
+
+Two backends are available: faster-whisper (CTranslate2, quantized int8
+GEMMs; the default) and the original openai-whisper (PyTorch).
 """
 
+import math
 import os
+import random
 import re
+import shutil
+import subprocess
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict
-import whisper
-import torch
+from typing import Any, List, Literal, Optional, Dict
+import numpy as np
 from pydub import AudioSegment
 from loguru import logger
 
 from config import settings
 
+try:
+    from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+except ImportError:
+    BatchedInferencePipeline = None
+    WhisperModel = None
+    decode_audio = None
+
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    from whisper_trt import load_trt_model
+except ImportError:
+    load_trt_model = None
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+try:
+    import torchaudio
+except ImportError:
+    torchaudio = None
+
+
+# Whisper models consume 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Formats picked up by process_audio_folder
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.ogg'})
+# Formats libsndfile decodes in-process (no ffmpeg subprocess)
+SOUNDFILE_EXTENSIONS = {'.wav', '.flac', '.ogg'}
 
 # Language code mapping
 LANGUAGE_MAP = {
@@ -23,46 +74,261 @@ LANGUAGE_MAP = {
     "kn": "kannada"
 }
 
+# Transcript cleanup patterns, compiled once
+FILLERS_BY_LANG = {
+    "en": ['um', 'uh', 'er', 'ah', 'hmm', 'like', 'you know'],
+    "hi": ['उम्', 'अह', 'हम्म', 'वो', 'यानी', 'मतलब'],
+    "te": ['అమ్మో', 'ఓహో', 'ఉహూం'],
+    "kn": ['ಅಮ್ಮೋ', 'ಓಹೋ']
+}
+NOISE_MARKERS = [
+    '[inaudible]', '[music]', '[noise]', '[applause]', '[laughter]',
+    '[अस्पष्ट]', '[संगीत]', '[शोर]'  # Hindi markers
+]
+_BRACKETED_TIMESTAMP_RE = re.compile(r'\[\d+:\d+:\d+\]')
+_TIMESTAMP_RE = re.compile(r'\d+:\d+:\d+')
+# Only English fillers are removed (case-insensitively); one alternation
+# instead of a pass per filler
+_EN_FILLER_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, FILLERS_BY_LANG["en"])) + r')\b', re.IGNORECASE
+)
+_SPEAKER_RE = re.compile(r'(?:Speaker|स्पीकर)\s*\d+\s*:', re.IGNORECASE)
+_NOISE_RE = re.compile('|'.join(map(re.escape, NOISE_MARKERS)))
+_PUNCT_SPACE_RE = re.compile(r'\s+([.,!?;:])')
+
+
+def _quantize_linear_layers(model):
+    """
+    Dynamically quantize an openai-whisper model's Linear layers to int8.
+    
+    Whisper builds its layers from whisper.model.Linear, a subclass of
+    nn.Linear that only casts the weight to the input dtype. quantize_dynamic
+    matches module types exactly (and its conversion rejects subclasses), so
+    they are retyped as plain nn.Linear first; in fp32 on the CPU the two
+    compute the same thing.
+    
+    Args:
+        model: openai-whisper model on the CPU
+    
+    Returns:
+        Tuple of the quantized model and the number of layers quantized
+    """
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized = sum(isinstance(module, torch.ao.nn.quantized.dynamic.Linear) for module in model.modules())
+    if not quantized:
+        raise RuntimeError("int8 quantization left every Linear layer unchanged")
+    return model, quantized
+
+
+@lru_cache(maxsize=4)
+def _load_model(
+    backend: str,
+    model_size: str,
+    device: str,
+    compute_type: str,
+    num_workers: int = 1,
+    quantize: bool = False,
+    compile_decoder: bool = False
+):
+    """Load Whisper weights once per process and configuration."""
+    if backend == "whisper_trt":
+        # TensorRT engines exist for the English-only checkpoints; the engine
+        # is built on first load and reused from the cache path afterwards
+        name = model_size if model_size.endswith(".en") else f"{model_size}.en"
+        return load_trt_model(name, path=settings.whisper_trt_engine or None)
+    if backend == "faster_whisper":
+        # num_workers lets concurrent transcribe() calls run in parallel on one model
+        return WhisperModel(model_size, device=device, compute_type=compute_type, num_workers=num_workers)
+    model = whisper.load_model(model_size, device=device)
+    if quantize and device == "cpu":
+        model, quantized = _quantize_linear_layers(model)
+        # Run one second of silence through it so the first real file does
+        # not pay for the quantized kernels' first-call setup
+        model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), fp16=False)
+        logger.info(f"Whisper model quantized to int8 for CPU ({quantized} Linear layers)")
+    elif compile_decoder and device == "cuda":
+        # The decoder runs once per token with dozens of small kernels;
+        # reduce-overhead replays each step as a CUDA graph. Compiled kernels
+        # are cached under TORCHINDUCTOR_CACHE_DIR across restarts.
+        model.decoder = torch.compile(model.decoder, mode="reduce-overhead")
+        # Compile and capture now rather than on the first real file
+        model.transcribe(np.zeros(SAMPLE_RATE * 30, dtype=np.float32), language="en", fp16=True)
+        logger.info("Whisper decoder compiled")
+    return model
+
 
 class MultilingualSpeechToTextConverter:
     """Handles multilingual audio file transcription using Whisper model."""
     
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", backend: Optional[str] = None, quantize: bool = True):
         """
         Initialize the Whisper model for multilingual transcription.
         
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
+            backend: "faster_whisper", "whisper" or "whisper_trt" (defaults to
+                WHISPER_BACKEND); falls back to whichever package is installed
+            quantize: Quantize the whisper backend's Linear layers to int8 when
+                running on CPU (faster_whisper already uses int8 there)
         """
         self.model_size = model_size
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Loading Whisper model '{model_size}' on device '{self.device}'")
-        self.model = whisper.load_model(model_size, device=self.device)
+        self.backend = self._resolve_backend(backend or settings.whisper_backend)
+        self.device = "cuda" if self._cuda_available() else "cpu"
+        if self.backend == "whisper_trt" and self.device != "cuda":
+            logger.warning("whisper_trt needs a CUDA GPU; using another backend")
+            self.backend = self._resolve_backend("faster_whisper")
+        logger.info(f"Loading Whisper model '{model_size}' ({self.backend}) on device '{self.device}'")
+        # int8 weights with fp16 activations on GPU, pure int8 on CPU
+        # (faster_whisper only)
+        compute_type = settings.whisper_compute_type or ("int8_float16" if self.device == "cuda" else "int8")
+        # Files transcribed concurrently by process_audio_folder; the PyTorch
+        # backend is not safe to call from several threads
+        self.workers = max(1, settings.whisper_workers) if self.backend == "faster_whisper" else 1
+        # Converters with the same configuration share one loaded model
+        self.model = _load_model(
+            self.backend, model_size, self.device, compute_type, self.workers, quantize, settings.whisper_compile
+        )
+        # Decodes a file's VAD chunks in batches instead of one window at a time
+        self.batched = None
+        if self.backend == "faster_whisper" and settings.whisper_batch_size > 1:
+            self.batched = BatchedInferencePipeline(model=self.model)
+        # CUDA graph of the language-detection forward pass (whisper backend),
+        # captured on first use and replayed for every later file
+        self._detect_graph = None
+        # (not combined with a compiled decoder, which captures its own graphs)
+        self._use_detect_graph = self.device == "cuda" and settings.whisper_cuda_graph and not settings.whisper_compile
+        # Host-to-device copies of prefetched mels overlap compute on this stream
+        self._copy_stream = torch.cuda.Stream() if self.backend == "whisper" and self.device == "cuda" else None
         self.supported_languages = settings.supported_languages
+        # Transcript directories already created by process_audio_file
+        self._made_dirs = set()
         logger.info(f"Multilingual support enabled for: {', '.join(self.supported_languages)}")
         logger.success("Whisper model loaded successfully")
     
-    def detect_language(self, audio_path: str) -> str:
+    @staticmethod
+    def _resolve_backend(backend: str) -> str:
+        """Pick the requested backend, or another one if it is not installed."""
+        available = {
+            "faster_whisper": WhisperModel is not None,
+            "whisper": whisper is not None,
+            "whisper_trt": load_trt_model is not None,
+        }
+        if backend not in available:
+            raise ValueError(f"Unknown Whisper backend: {backend}")
+        if available[backend]:
+            return backend
+        fallback = next((b for b in ("faster_whisper", "whisper") if b != backend and available[b]), None)
+        if fallback is None:
+            raise ImportError("Install faster-whisper or openai-whisper for speech-to-text")
+        logger.warning(f"Whisper backend '{backend}' is not installed; using '{fallback}'")
+        return fallback
+    
+    @staticmethod
+    def _cuda_available() -> bool:
+        if torch is not None:
+            return torch.cuda.is_available()
+        try:
+            import ctranslate2
+            return ctranslate2.get_cuda_device_count() > 0
+        except Exception:
+            return False
+    
+    def load_audio(self, audio_path: str, for_detection: bool = True) -> Dict[str, Any]:
+        """
+        Decode an audio file on the CPU, ready for the model.
+        
+        Only touches the model's configuration, so it can run in a worker
+        thread while the model transcribes another file.
+        
+        Args:
+            audio_path: Path to the audio file
+            for_detection: Also compute the 30 s log-Mel spectrogram used for
+                language detection (whisper backend)
+        
+        Returns:
+            Dictionary with 'audio' (16 kHz float32 samples) and, when
+            requested, 'mel'
+        """
+        audio = self._read_audio(audio_path)
+        if audio is None:
+            # faster_whisper decodes with PyAV in-process; whisper forks ffmpeg
+            audio = decode_audio(audio_path) if self.backend == "faster_whisper" else whisper.load_audio(audio_path)
+        prepared = {"audio": audio}
+        if self.backend != "whisper":
+            return prepared
+        if for_detection:
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=self.model.dims.n_mels)
+            # Page-locked so the copy to the GPU can be asynchronous
+            prepared["mel"] = mel.pin_memory() if self.device == "cuda" else mel
+        return prepared
+    
+    @staticmethod
+    def _read_audio(audio_path: str) -> Optional[np.ndarray]:
+        """
+        Decode WAV/FLAC/OGG with soundfile into 16 kHz mono float32.
+        
+        Returns None (caller falls back to ffmpeg) for other formats, when
+        soundfile is missing, or when resampling is needed without torchaudio.
+        """
+        if soundfile is None or Path(audio_path).suffix.lower() not in SOUNDFILE_EXTENSIONS:
+            return None
+        try:
+            # Header-only check, so an unresamplable file is never fully read
+            if soundfile.info(audio_path).samplerate != SAMPLE_RATE and torchaudio is None:
+                return None
+            data, sample_rate = soundfile.read(audio_path, dtype="float32", always_2d=True)
+            audio = data.mean(axis=1)
+            if sample_rate != SAMPLE_RATE:
+                audio = torchaudio.functional.resample(torch.from_numpy(audio), sample_rate, SAMPLE_RATE).numpy()
+            return np.ascontiguousarray(audio, dtype=np.float32)
+        except Exception as e:
+            logger.debug(f"soundfile could not decode {audio_path}: {e}")
+            return None
+    
+    def _mel_to_device(self, mel):
+        if self._copy_stream is None:
+            return mel.to(self.model.device)
+        with torch.cuda.stream(self._copy_stream):
+            mel = mel.to(self.model.device, non_blocking=True)
+        current = torch.cuda.current_stream()
+        current.wait_stream(self._copy_stream)
+        mel.record_stream(current)
+        return mel
+    
+    def detect_language(self, audio_path: str, prepared: Optional[Dict[str, Any]] = None) -> str:
         """
         Detect the language of an audio file.
         
         Args:
             audio_path: Path to the audio file
+            prepared: Output of `load_audio` for this file, if already decoded
         
         Returns:
             Detected language code (en, hi, te, kn)
         """
         try:
-            # Load audio and pad/trim it to fit 30 seconds
-            audio = whisper.load_audio(audio_path)
-            audio = whisper.pad_or_trim(audio)
-            
-            # Make log-Mel spectrogram and move to the same device as the model
-            mel = whisper.log_mel_spectrogram(audio).to(self.model.device)
-            
-            # Detect the spoken language
-            _, probs = self.model.detect_language(mel)
-            detected_lang = max(probs, key=probs.get)
+            if self.backend == "faster_whisper":
+                # Only the first 30 s reach the model: detection computes
+                # log-Mel features over whatever audio it is given
+                if not prepared:
+                    prepared = self.load_audio(audio_path, for_detection=False)
+                detected_lang, _, _ = self.model.detect_language(prepared["audio"][:30 * SAMPLE_RATE])
+            elif self.backend == "whisper_trt":
+                # The TensorRT engines are built from English-only checkpoints
+                detected_lang = "en"
+            else:
+                if not prepared or "mel" not in prepared:
+                    prepared = self.load_audio(audio_path)
+                
+                # Move the log-Mel spectrogram to the same device as the model
+                mel = self._mel_to_device(prepared["mel"])
+                
+                # Detect the spoken language
+                with self._attention_kernels():
+                    detected_lang = self._detect_whisper_language(mel)
             
             # Map to supported languages
             if detected_lang in self.supported_languages:
@@ -75,11 +341,94 @@ class MultilingualSpeechToTextConverter:
             logger.error(f"Error detecting language: {str(e)}")
             return "en"
     
+    def _attention_kernels(self):
+        """
+        Restrict openai-whisper's scaled_dot_product_attention to the fused
+        flash / memory-efficient kernels on CUDA, so the 1500-frame encoder
+        never materializes its attention matrix; the math kernel stays as the
+        fallback for inputs the fused kernels reject.
+        """
+        if self.device != "cuda" or not hasattr(torch.nn, "attention"):
+            return nullcontext()
+        from torch.nn.attention import SDPBackend, sdpa_kernel
+        return sdpa_kernel([SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION, SDPBackend.MATH])
+    
+    def _detect_whisper_language(self, mel) -> str:
+        """
+        Detect the language of a 30 s log-Mel spectrogram with openai-whisper.
+        
+        On CUDA the encoder pass plus the single decoder step that scores the
+        language tokens always has the same shapes, so it is captured once as
+        a CUDA graph; each later call is a copy into the static input and a
+        replay, with no per-kernel launch overhead.
+        
+        Args:
+            mel: (n_mels, 3000) spectrogram on the model's device
+        
+        Returns:
+            Whisper language code
+        """
+        if not self._use_detect_graph:
+            _, probs = self.model.detect_language(mel)
+            return self._most_probable(probs)
+        
+        try:
+            if self._detect_graph is None:
+                self._capture_detect_graph()
+            self._mel_static.copy_(mel.unsqueeze(0))
+            self._detect_graph.replay()
+            return self._language_codes[int(self._language_logits_static.argmax(dim=-1)[0])]
+        except Exception as e:
+            logger.warning(f"CUDA graph language detection failed ({e}); using eager mode")
+            self._use_detect_graph = False
+            _, probs = self.model.detect_language(mel)
+            return self._most_probable(probs)
+    
+    @staticmethod
+    def _most_probable(probs: Dict[str, float]) -> str:
+        """Language code with the highest probability in whisper's ~100-entry dict."""
+        codes = list(probs)
+        scores = np.fromiter(probs.values(), dtype=np.float32, count=len(codes))
+        return codes[int(scores.argmax())]
+    
+    def _capture_detect_graph(self) -> None:
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            self.model.is_multilingual, num_languages=self.model.num_languages
+        )
+        dtype = next(self.model.parameters()).dtype
+        self._mel_static = torch.zeros(
+            (1, self.model.dims.n_mels, whisper.audio.N_FRAMES), device=self.device, dtype=dtype
+        )
+        sot = torch.tensor([[tokenizer.sot]], device=self.device)
+        language_tokens = torch.tensor(tokenizer.all_language_tokens, device=self.device)
+        self._language_codes = list(tokenizer.all_language_codes)
+        
+        def forward():
+            audio_features = self.model.encoder(self._mel_static)
+            logits = self.model.logits(sot, audio_features)[:, 0]
+            return logits.index_select(-1, language_tokens)
+        
+        with torch.no_grad():
+            # Warm up on a side stream (allocator and cuDNN autotuning) before capture
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    forward()
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                self._language_logits_static = forward()
+        self._detect_graph = graph
+        logger.info("Captured CUDA graph for language detection")
+    
     def transcribe_audio(
         self, 
         audio_path: str, 
         language: Optional[str] = None,
-        auto_detect: bool = True
+        auto_detect: bool = True,
+        prepared: Optional[Dict[str, Any]] = None
     ) -> Dict[str, str]:
         """
         Transcribe a single audio file to text with language detection.
@@ -88,16 +437,21 @@ class MultilingualSpeechToTextConverter:
             audio_path: Path to the audio file
             language: Language code (en, hi, te, kn). If None, auto-detect
             auto_detect: Whether to auto-detect language
+            prepared: Output of `load_audio` for this file, if already decoded
         
         Returns:
             Dictionary with 'text' and 'language' keys
         """
         try:
             logger.info(f"Transcribing audio file: {audio_path}")
+            if prepared is None:
+                # Decode once and share the samples with language detection
+                prepared = self.load_audio(audio_path, for_detection=language is None and auto_detect)
+            source = prepared["audio"]
             
             # Detect language if not specified
             if language is None and auto_detect:
-                language = self.detect_language(audio_path)
+                language = self.detect_language(audio_path, prepared)
             elif language is None:
                 language = settings.default_language
             
@@ -107,15 +461,46 @@ class MultilingualSpeechToTextConverter:
                 language = settings.default_language
             
             # Transcribe
-            result = self.model.transcribe(
-                audio_path,
-                language=language,
-                task="transcribe",
-                fp16=False  # Use fp32 for CPU compatibility
-            )
-            
-            text = result["text"]
-            detected_lang = result.get("language", language)
+            if self.batched is not None:
+                segments, info = self.batched.transcribe(
+                    source,
+                    language=language,
+                    task="transcribe",
+                    beam_size=1,
+                    batch_size=settings.whisper_batch_size
+                )
+                text = "".join(segment.text for segment in segments)
+                detected_lang = info.language or language
+            elif self.backend == "faster_whisper":
+                segments, info = self.model.transcribe(
+                    source,
+                    language=language,
+                    task="transcribe",
+                    beam_size=1,
+                    vad_filter=True
+                )
+                text = "".join(segment.text for segment in segments)
+                detected_lang = info.language or language
+            elif self.backend == "whisper_trt":
+                if language != "en":
+                    logger.warning(f"whisper_trt models are English-only; transcribing {audio_path} as English")
+                text = self.model.transcribe(source)["text"]
+                detected_lang = "en"
+            else:
+                if self.device == "cuda":
+                    # transcribe() computes the whole file's log-Mel spectrogram
+                    # on the device of the samples it is given, so the STFT
+                    # runs on the GPU instead of the CPU
+                    source = torch.from_numpy(source).to(self.device)
+                with self._attention_kernels():
+                    result = self.model.transcribe(
+                        source,
+                        language=language,
+                        task="transcribe",
+                        fp16=self.device == "cuda"  # fp32 on CPU
+                    )
+                text = result["text"]
+                detected_lang = result.get("language", language)
             
             logger.success(f"Transcription completed for: {audio_path} (Language: {detected_lang})")
             
@@ -140,43 +525,31 @@ class MultilingualSpeechToTextConverter:
         Returns:
             Cleaned text
         """
-        # Remove timestamps (e.g., [00:12:34])
-        text = re.sub(r'\[\d+:\d+:\d+\]', '', text)
-        text = re.sub(r'\d+:\d+:\d+', '', text)
-        
-        # Language-specific filler words
-        fillers_by_lang = {
-            "en": ['um', 'uh', 'er', 'ah', 'hmm', 'like', 'you know'],
-            "hi": ['उम्', 'अह', 'हम्म', 'वो', 'यानी', 'मतलब'],
-            "te": ['అమ్మో', 'ఓహో', 'ఉహూం'],
-            "kn": ['ಅಮ್ಮೋ', 'ಓಹೋ']
-        }
+        # Timestamps, speaker labels and noise markers all contain a ':' or
+        # '['; a substring check skips their regex scans on most transcripts
         
-        fillers = fillers_by_lang.get(language, fillers_by_lang["en"])
+        # Remove timestamps (e.g., [00:12:34])
+        if ':' in text:
+            text = _BRACKETED_TIMESTAMP_RE.sub('', text)
+            text = _TIMESTAMP_RE.sub('', text)
         
         # Remove filler words (case-insensitive for English)
         if language == "en":
-            for filler in fillers:
-                pattern = r'\b' + re.escape(filler) + r'\b'
-                text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+            text = _EN_FILLER_RE.sub('', text)
         
-        # Remove multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        # Remove multiple spaces (split/join; the ends are stripped below)
+        text = ' '.join(text.split())
         
-        # Remove speaker labels (e.g., "Speaker 1:")
-        text = re.sub(r'Speaker\s*\d+\s*:', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'स्पीकर\s*\d+\s*:', '', text)  # Hindi
+        # Remove speaker labels (e.g., "Speaker 1:", "स्पीकर 1:")
+        if ':' in text:
+            text = _SPEAKER_RE.sub('', text)
         
         # Remove noise markers
-        noise_markers = [
-            '[inaudible]', '[music]', '[noise]', '[applause]', '[laughter]',
-            '[अस्पष्ट]', '[संगीत]', '[शोर]'  # Hindi markers
-        ]
-        for marker in noise_markers:
-            text = text.replace(marker, '')
+        if '[' in text:
+            text = _NOISE_RE.sub('', text)
         
         # Clean up punctuation
-        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        text = _PUNCT_SPACE_RE.sub(r'\1', text)
         
         # Trim whitespace
         text = text.strip()
@@ -186,7 +559,11 @@ class MultilingualSpeechToTextConverter:
     @staticmethod
     def convert_audio_format(input_path: str, output_path: str, format: str = "wav") -> str:
         """
-        Convert audio file to a different format.
+        Convert audio file to a different format, as 16 kHz mono.
+        
+        ffmpeg is called directly so the samples stream from input to output
+        without being loaded into Python; pydub is only used when ffmpeg is
+        not on PATH.
         
         Args:
             input_path: Path to input audio file
@@ -198,10 +575,25 @@ class MultilingualSpeechToTextConverter:
         """
         try:
             logger.info(f"Converting {input_path} to {format}")
-            audio = AudioSegment.from_file(input_path)
-            audio.export(output_path, format=format)
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg:
+                codec = {"wav": ["-c:a", "pcm_s16le"], "mp3": ["-c:a", "libmp3lame"]}.get(format, [])
+                subprocess.run(
+                    [ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-threads", "0",
+                     "-i", input_path, "-ac", "1", "-ar", str(SAMPLE_RATE), *codec,
+                     "-f", format, output_path],
+                    check=True,
+                    capture_output=True
+                )
+            else:
+                audio = AudioSegment.from_file(input_path)
+                audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE)
+                audio.export(output_path, format=format)
             logger.success(f"Converted to: {output_path}")
             return output_path
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error converting audio format: {e.stderr.decode(errors='replace').strip()}")
+            raise
         except Exception as e:
             logger.error(f"Error converting audio format: {str(e)}")
             raise
@@ -211,7 +603,8 @@ class MultilingualSpeechToTextConverter:
         audio_path: str,
         output_txt_path: Optional[str] = None,
         language: Optional[str] = None,
-        auto_detect: bool = True
+        auto_detect: bool = True,
+        prepared: Optional[Dict[str, Any]] = None
     ) -> Dict[str, str]:
         """
         Process a single audio file: transcribe and clean.
@@ -221,21 +614,37 @@ class MultilingualSpeechToTextConverter:
             output_txt_path: Path to save cleaned transcript (optional)
             language: Language code (if known)
             auto_detect: Whether to auto-detect language
+            prepared: Output of `load_audio` for this file, if already decoded
         
         Returns:
             Dictionary with 'text' and 'language'
         """
         # Transcribe
-        result = self.transcribe_audio(audio_path, language, auto_detect)
+        result = self.transcribe_audio(audio_path, language, auto_detect, prepared)
         
         # Clean
         cleaned_text = self.clean_transcript(result["text"], result["language"])
         
         # Save if output path provided
         if output_txt_path:
-            Path(output_txt_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(output_txt_path, 'w', encoding='utf-8') as f:
-                f.write(cleaned_text)
+            # Folder runs write every transcript into the same directory
+            parent = os.path.dirname(output_txt_path)
+            if parent and parent not in self._made_dirs:
+                os.makedirs(parent, exist_ok=True)
+                self._made_dirs.add(parent)
+            # Write a uniquely named file next to the target and swap it in,
+            # so a failure never leaves a half-written transcript behind and
+            # concurrent workers with the same stem never share a temp file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=parent or None, prefix=os.path.basename(output_txt_path) + ".", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                    f.write(cleaned_text)
+                os.replace(tmp_path, output_txt_path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
             logger.info(f"Cleaned transcript saved to: {output_txt_path}")
         
         return {
@@ -243,11 +652,41 @@ class MultilingualSpeechToTextConverter:
             "language": result["language"]
         }
     
+    def _process_into_folder(
+        self,
+        audio_file: str,
+        output_folder_path: Path,
+        auto_detect: bool,
+        prepared: Optional[Dict[str, Any]] = None,
+        language: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
+        """Process one file of a folder run; returns its transcript info, or None on failure."""
+        try:
+            stem = os.path.splitext(os.path.basename(audio_file))[0]
+            output_txt = output_folder_path / f"{stem}.txt"
+            result = self.process_audio_file(
+                audio_file,
+                str(output_txt),
+                language=language,
+                auto_detect=auto_detect,
+                prepared=prepared
+            )
+            return {
+                "audio_file": audio_file,
+                "transcript_file": str(output_txt),
+                "language": result["language"]
+            }
+        except Exception as e:
+            logger.error(f"Failed to process {audio_file}: {str(e)}")
+            return None
+    
     def process_audio_folder(
         self,
         audio_folder: Optional[str] = None,
         output_folder: Optional[str] = None,
-        auto_detect: bool = True
+        auto_detect: bool = True,
+        detection_strategy: Literal["per_file", "sample", "fixed"] = "per_file",
+        language: Optional[str] = None
     ) -> List[Dict[str, str]]:
         """
         Process all audio files in a folder with multilingual support.
@@ -255,7 +694,13 @@ class MultilingualSpeechToTextConverter:
         Args:
             audio_folder: Path to folder containing audio files
             output_folder: Path to save transcripts (saved to data folder)
-            auto_detect: Whether to auto-detect language for each file
+            auto_detect: Whether to auto-detect language
+            detection_strategy: "per_file" (default) detects every file's
+                language; "sample" detects a few files (about sqrt(N), at
+                least 3) and uses the majority language for the whole
+                folder, which is faster for monolingual folders; "fixed"
+                uses `language` for every file
+            language: Language code for the whole folder; skips detection
         
         Returns:
             List of dictionaries with transcript info
@@ -263,16 +708,17 @@ class MultilingualSpeechToTextConverter:
         audio_folder = audio_folder or settings.audio_folder
         output_folder = output_folder or settings.data_folder  # Save to data folder
         
-        audio_folder_path = Path(audio_folder)
         output_folder_path = Path(output_folder)
         output_folder_path.mkdir(parents=True, exist_ok=True)
         
-        # Supported audio formats
-        audio_extensions = ['.mp3', '.wav', '.m4a', '.flac', '.ogg']
-        audio_files = [
-            f for f in audio_folder_path.iterdir()
-            if f.suffix.lower() in audio_extensions
-        ]
+        # scandir reads the file type from the directory entry itself, so
+        # listing costs no stat() per file; paths stay plain strings
+        with os.scandir(audio_folder) as entries:
+            audio_files = [
+                entry.path for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS
+            ]
         
         if not audio_files:
             logger.warning(f"No audio files found in {audio_folder}")
@@ -280,23 +726,48 @@ class MultilingualSpeechToTextConverter:
         
         logger.info(f"Found {len(audio_files)} audio files to process")
         
-        transcript_info = []
-        for audio_file in audio_files:
-            try:
-                output_txt = output_folder_path / f"{audio_file.stem}.txt"
-                result = self.process_audio_file(
-                    str(audio_file),
-                    str(output_txt),
-                    auto_detect=auto_detect
-                )
-                transcript_info.append({
-                    "audio_file": str(audio_file),
-                    "transcript_file": str(output_txt),
-                    "language": result["language"]
-                })
-            except Exception as e:
-                logger.error(f"Failed to process {audio_file}: {str(e)}")
-                continue
+        if detection_strategy not in ("per_file", "sample", "fixed"):
+            raise ValueError(f"Unknown detection strategy: {detection_strategy}")
+        if detection_strategy == "fixed" and language is None:
+            raise ValueError("detection_strategy='fixed' requires a language")
+        if language is None and auto_detect and detection_strategy == "sample":
+            # Folders are usually monolingual; a detection pass per file is a
+            # full encoder forward spent on the same answer
+            sample = random.sample(audio_files, min(len(audio_files), max(3, math.isqrt(len(audio_files)))))
+            votes = Counter(self.detect_language(audio_file) for audio_file in sample)
+            language = votes.most_common(1)[0][0]
+            logger.info(f"Folder language: {LANGUAGE_MAP.get(language, language)} ({dict(votes)} from {len(sample)} sampled files)")
+        if language is not None:
+            auto_detect = False
+        
+        if self.workers > 1:
+            # Each thread decodes, transcribes and cleans its own file; the
+            # shared model runs up to `workers` transcriptions in parallel
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(
+                    lambda audio_file: self._process_into_folder(
+                        audio_file, output_folder_path, auto_detect, language=language
+                    ),
+                    audio_files
+                ))
+        else:
+            results = []
+            # Decode the next file (ffmpeg + mel on the CPU) while the model
+            # works on the current one
+            with ThreadPoolExecutor(max_workers=1) as loader:
+                pending = loader.submit(self.load_audio, audio_files[0], auto_detect)
+                for i, audio_file in enumerate(audio_files):
+                    try:
+                        prepared = pending.result()
+                    except Exception as e:
+                        logger.warning(f"Prefetch failed for {audio_file}: {e}")
+                        prepared = None
+                    if i + 1 < len(audio_files):
+                        pending = loader.submit(self.load_audio, audio_files[i + 1], auto_detect)
+                    results.append(
+                        self._process_into_folder(audio_file, output_folder_path, auto_detect, prepared, language)
+                    )
+        transcript_info = [info for info in results if info is not None]
         
         logger.success(f"Processed {len(transcript_info)} audio files successfully")
         
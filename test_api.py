@@ -1,81 +1,39 @@
 #!/usr/bin/env python3
-"""Test the API"""
-import subprocess
-import time
-import requests
-from ask import SimpleChatbot
+"""Test the chatbot directly and through simple_api"""
+import pytest
 
-print("=" * 60)
-print("TESTING CHATBOT & API")
-print("=" * 60)
 
-# Test 1: Direct Chatbot
-print("\n1️⃣  TESTING DIRECT CHATBOT")
-print("-" * 60)
-chatbot = SimpleChatbot()
+ANSWER_KEYS = {"answer", "language", "sources", "is_safe"}
 
-# English
-result = chatbot.ask('What is devotion?')
-print(f"✅ English: {result['language']}")
-print(f"   Answer: {result['answer'][:70]}...")
 
-# Hindi
-result = chatbot.ask('भक्ति क्या है?')
-print(f"✅ Hindi: {result['language']}")
-print(f"   Answer: {result['answer'][:70]}...")
+@pytest.mark.parametrize("question", ["What is devotion?", "भक्ति क्या है?"])
+def test_chatbot_answers(chatbot, question):
+    result = chatbot.ask(question)
+    assert ANSWER_KEYS <= result.keys()
+    assert isinstance(result["answer"], str)
 
-# Test 2: API Server
-print("\n2️⃣  TESTING API SERVER")
-print("-" * 60)
 
-# Start API server in background
-print("Starting API server...")
-server = subprocess.Popen(['python', 'simple_api.py'], 
-                         stdout=subprocess.PIPE, 
-                         stderr=subprocess.PIPE)
+def test_health(simple_client):
+    response = simple_client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
 
-time.sleep(4)
 
-try:
-    # Health check
-    response = requests.get('http://localhost:8000/health', timeout=5)
-    print(f"✅ Health Check: {response.status_code}")
-    print(f"   Status: {response.json()}")
-    
-    # Test POST /ask
-    response = requests.post(
-        'http://localhost:8000/ask',
-        json={'question': 'What is karma?'},
-        timeout=5
-    )
-    print(f"\n✅ POST /ask: {response.status_code}")
+def test_post_ask(simple_client):
+    response = simple_client.post("/ask", json={"question": "What is karma?"})
+    assert response.status_code == 200
     data = response.json()
-    print(f"   Answer: {data['answer'][:70]}...")
-    print(f"   Language: {data['language']}")
-    print(f"   Safe: {data['is_safe']}")
-    
-    # Test GET /ask
-    response = requests.get(
-        'http://localhost:8000/ask?question=What%20is%20meditation?',
-        timeout=5
-    )
-    print(f"\n✅ GET /ask: {response.status_code}")
-    data = response.json()
-    print(f"   Answer: {data['answer'][:70]}...")
-    
-    # Test Languages endpoint
-    response = requests.get('http://localhost:8000/languages', timeout=5)
-    print(f"\n✅ GET /languages: {response.status_code}")
-    data = response.json()
-    print(f"   Languages: {[l['name'] for l in data['supported_languages']]}")
-    
-    print("\n" + "=" * 60)
-    print("✅ ALL TESTS PASSED!")
-    print("=" * 60)
-    
-except Exception as e:
-    print(f"❌ Error: {e}")
-    
-finally:
-    server.terminate()
-    server.wait()
+    assert ANSWER_KEYS <= data.keys()
+
+
+def test_get_ask(simple_client):
+    response = simple_client.get("/ask", params={"question": "What is meditation?"})
+    assert response.status_code == 200
+    assert isinstance(response.json()["answer"], str)
+
+
+def test_languages(simple_client):
+    response = simple_client.get("/languages")
+    assert response.status_code == 200
+    names = [lang["name"] for lang in response.json()["supported_languages"]]
+    assert "English" in names
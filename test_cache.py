@@ -0,0 +1,54 @@
+"""Behaviour tests for the persistent query cache"""
+import numpy as np
+
+from cache import QueryCache, open_query_cache
+
+
+class _Embedder:
+    """Records which texts reach the model."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_get_or_embed_many_embeds_only_misses_in_one_call(tmp_path):
+    cache = QueryCache(str(tmp_path / "q.sqlite3"), "model-a")
+    embed = _Embedder()
+
+    first = cache.get_or_embed_many(["a", "bb"], embed)
+    second = cache.get_or_embed_many(["bb", "ccc", "a"], embed)
+
+    assert embed.calls == [["a", "bb"], ["ccc"]]
+    assert second.dtype == np.float32 and second.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(second, [[2, 1], [3, 1], [1, 1]])
+    np.testing.assert_array_equal(first, second[[2, 0]])
+
+
+def test_embeddings_persist_per_model(tmp_path):
+    path = str(tmp_path / "q.sqlite3")
+    cache = QueryCache(path, "model-a")
+    cache.get_or_embed_many(["a"], _Embedder())
+    cache.close()
+
+    embed = _Embedder()
+    QueryCache(path, "model-a").get_or_embed_many(["a"], embed)
+    assert embed.calls == []
+    QueryCache(path, "model-b").get_or_embed_many(["a"], embed)
+    assert embed.calls == [["a"]]
+
+
+def test_hits_are_keyed_by_k_and_index_version(tmp_path):
+    cache = QueryCache(str(tmp_path / "q.sqlite3"), "model-a")
+    cache.put_hits("a", 3, "v1", [7, 2, 9])
+
+    assert cache.get_hits("a", 3, "v1") == [7, 2, 9]
+    assert cache.get_hits("a", 5, "v1") is None
+    assert cache.get_hits("a", 3, "v2") is None
+
+
+def test_open_query_cache_disabled_by_empty_path():
+    assert open_query_cache("", "model-a") is None
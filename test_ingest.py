@@ -0,0 +1,38 @@
+"""Behaviour tests for ingest.py index persistence"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("pypdf")
+
+from ingest import write_index
+
+
+def _flat_index(n):
+    index = faiss.IndexFlatIP(8)
+    index.add(np.random.default_rng(n).random((n, 8), dtype=np.float32))
+    return index
+
+
+def test_concurrent_write_index_leaves_one_complete_file(tmp_path):
+    path = tmp_path / "index.faiss"
+    sizes = [10, 20, 30, 40]
+    with ThreadPoolExecutor(max_workers=len(sizes)) as pool:
+        list(pool.map(lambda n: write_index(_flat_index(n), path), sizes))
+
+    assert faiss.read_index(str(path)).ntotal in sizes
+    assert [p.name for p in tmp_path.iterdir()] == ["index.faiss"]
+
+
+def test_write_index_removes_temp_file_on_failure(tmp_path, monkeypatch):
+    def fail(index, name):
+        open(name, "wb").write(b"partial")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(faiss, "write_index", fail)
+    with pytest.raises(RuntimeError):
+        write_index(_flat_index(5), tmp_path / "index.faiss")
+    assert list(tmp_path.iterdir()) == []
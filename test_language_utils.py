@@ -0,0 +1,17 @@
+"""Behaviour tests for language detection"""
+import pytest
+
+from language_utils import LanguageDetector
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("भक्ति क्या है?", "hi"),
+    ("नेनु शांति।", "hi"),
+    ("నేను శాంతిని ఎలా పొందగలను।", "te"),
+    ("ಧರ್ಮ ಎಂದರೆ ಏನು। ಅದನ್ನು ಹೇಗೆ ಪಾಲಿಸುವುದು॥", "kn"),
+    ("What is the meaning of ॐ in prayer?", "en"),
+    ("Sai Baba says भक्ति ही मार्ग है और प्रेम ही धर्म है", "hi"),
+    ("Explain the word ధర్మం in simple English please", "en"),
+])
+def test_script_detection_counts_letters(text, expected):
+    assert LanguageDetector().detect_language(text) == expected
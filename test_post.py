@@ -1,9 +1,7 @@
-import requests, json, sys
+"""Test POST /ask on simple_api"""
 
-try:
-    r = requests.post('http://127.0.0.1:8000/ask', json={'question':'What is devotion?'}, timeout=30)
-    print('STATUS', r.status_code)
-    print(json.dumps(r.json(), indent=2, ensure_ascii=False))
-except Exception as e:
-    print('ERROR', e)
-    sys.exit(1)
+
+def test_post_devotion(simple_client):
+    r = simple_client.post("/ask", json={"question": "What is devotion?"})
+    assert r.status_code == 200
+    assert "answer" in r.json()
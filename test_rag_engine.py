@@ -0,0 +1,303 @@
+"""Behaviour tests for rag_engine helpers, caches and the CLI"""
+import asyncio
+import builtins
+import subprocess
+import sys
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import rag_engine
+from language_utils import LanguageDetector
+
+
+class _StreamingEngine:
+    """Stand-in engine with an LLM configured, for the CLI loop."""
+
+    llm = object()
+
+    def validate_system(self):
+        return {"status": "healthy"}
+
+    async def astream_answer(self, question, detected_language=None):
+        yield "My child, "
+        yield "be at peace."
+
+
+def test_main_streams_answers_with_llm(monkeypatch, capsys):
+    questions = iter(["What is devotion?", "quit"])
+    monkeypatch.setattr(rag_engine, "MultilingualRAGEngine", _StreamingEngine)
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(questions))
+
+    rag_engine.main()
+
+    assert "Answer: My child, be at peace." in capsys.readouterr().out
+
+
+def test_imports_without_numpy():
+    # numpy is an optional import; the module must still load without it
+    code = "import sys; sys.modules['numpy'] = None; import rag_engine; assert rag_engine.np is None"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_top_k_matches_full_sort():
+    rng = np.random.default_rng(0)
+    scores = rng.random(50)
+    scores[[3, 7]] = scores.max() + 1  # tie: the earlier index comes first
+    for k in (1, 5, 50, 80):
+        expected = np.argsort(-scores, kind="stable")[:k]
+        assert rag_engine._top_k(scores, k).tolist() == expected.tolist()
+
+
+class _DocStore:
+    """Vector store stand-in that returns one fixed passage."""
+
+    def __init__(self):
+        self.searches = 0
+
+    def embed_query(self, question):
+        return np.ones((1, 4), dtype=np.float32)
+
+    def similarity_search_by_vector(self, embedding, k):
+        return self.similarity_search(None, k)
+
+    def similarity_search(self, question, k):
+        self.searches += 1
+        return [SimpleNamespace(page_content="Love all, serve all.", metadata={"source": "talks.txt"})]
+
+
+def _offline_engine(vector_store=None, semantic=False):
+    """An engine in RAG-only mode, built without loading any models."""
+    engine = object.__new__(rag_engine.MultilingualRAGEngine)
+    engine.safety_filter = rag_engine.SafetyFilter()
+    engine.language_detector = LanguageDetector()
+    engine.response_cache = rag_engine.ResponseCache(maxsize=8, semantic=semantic)
+    engine.vector_store = vector_store
+    engine.reranker = None
+    engine.llm = None
+    return engine
+
+
+def test_response_cache_exact_tier_normalizes_and_returns_copies():
+    cache = rag_engine.ResponseCache(maxsize=2, semantic=False)
+    key = cache.make_key("what is  devotion? ", "en", True)
+    cache.put(key, rag_engine.QAResult(answer="Love.", language="en"))
+
+    hit = cache.get(cache.make_key("what is devotion?", "en", True))
+    assert hit.answer == "Love."
+    hit.answer = "changed"
+    assert cache.get(key).answer == "Love."
+    assert cache.get(cache.make_key("what is devotion?", "hi", True)) is None
+
+    for question in ("one", "two"):
+        cache.put(cache.make_key(question, "en", True), rag_engine.QAResult(answer=question, language="en"))
+    assert cache.get(key) is None  # evicted first-in
+
+
+def test_response_cache_semantic_tier_matches_same_language_only():
+    cache = rag_engine.ResponseCache(maxsize=4, similarity_threshold=0.9)
+    key = cache.make_key("what is devotion?", "en", True)
+    cache.put(key, rag_engine.QAResult(answer="Love.", language="en"), np.array([[1.0, 0.0]], dtype=np.float32))
+
+    near = np.array([[0.99, 0.05]], dtype=np.float32)
+    other = cache.make_key("define devotion", "en", True)
+    assert cache.get(other) is None
+    assert cache.get_similar(other, near).answer == "Love."
+    assert cache.get_similar(cache.make_key("define devotion", "hi", True), near) is None
+    assert cache.get_similar(other, np.array([[0.0, 1.0]], dtype=np.float32)) is None
+
+
+def test_prepare_question_looks_up_exact_tier_once(monkeypatch):
+    engine = _offline_engine(_DocStore(), semantic=True)
+    lookups = []
+    get = engine.response_cache.get
+    monkeypatch.setattr(engine.response_cache, "get", lambda key: lookups.append(key) or get(key))
+
+    engine.answer_question("What is devotion?")
+    assert len(lookups) == 1
+    cached = engine.answer_question("What is devotion?")
+
+    assert len(lookups) == 2
+    assert engine.vector_store.searches == 1
+    assert "Love all, serve all." in cached.answer
+
+
+def test_no_info_answers_are_not_cached():
+    engine = _offline_engine(vector_store=None)
+    first = engine.answer_question("What is devotion?")
+    assert first.sources == ()
+
+    # Once the vector store is available the same question gets a real answer
+    engine.vector_store = _DocStore()
+    second = engine.answer_question("What is devotion?")
+    assert engine.vector_store.searches == 1
+    assert "Love all, serve all." in second.answer
+
+
+def test_cache_hit_stops_background_retrieval_before_search():
+    store = _DocStore()
+    gate = threading.Event()
+    gate.set()
+    embed_query = store.embed_query
+    store.embed_query = lambda question: gate.wait() and embed_query(question)
+    engine = _offline_engine(store)
+    engine._io_pool = ThreadPoolExecutor(max_workers=1)
+    engine.answer_question("What is devotion?")
+    assert store.searches == 1
+
+    # The repeat is a cache hit while its retrieval job is still embedding
+    gate.clear()
+    cached = engine.answer_question("What is devotion?")
+    gate.set()
+    engine._io_pool.shutdown(wait=True)
+
+    assert "Love all, serve all." in cached.answer
+    assert store.searches == 1
+
+
+class _TokenLLM:
+    """LLM stand-in that streams a fixed list of tokens."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    async def astream(self, messages):
+        for token in self.tokens:
+            yield SimpleNamespace(content=token)
+
+
+def _stream(engine, question, language="en"):
+    async def collect():
+        return [chunk async for chunk in engine.astream_answer(question, language)]
+    return asyncio.run(collect())
+
+
+def _streaming_engine(tokens):
+    engine = _offline_engine(_DocStore())
+    engine.llm = _TokenLLM(tokens)
+    engine._format_messages = lambda docs, question, language: "prompt"
+    return engine
+
+
+def test_stream_filters_each_sentence_before_yielding():
+    tokens = [" Serve others", " with love. I am", " God, so trust", " me.\nPray daily", " and stay calm."]
+    chunks = _stream(_streaming_engine(tokens), "What is devotion?")
+
+    assert chunks == [
+        "Serve others with love. ",
+        "Sai Baba teaches, so trust me.\n",
+        "Pray daily and stay calm.",
+    ]
+    assert not any("God" in chunk for chunk in chunks)
+
+
+def test_stream_retrieves_off_the_event_loop():
+    engine = _streaming_engine(["Serve others with love and remember the Lord in every act."])
+    search = engine.vector_store.similarity_search
+
+    def slow_search(question, k):
+        time.sleep(0.2)
+        return search(question, k)
+
+    engine.vector_store.similarity_search = slow_search
+    ticks = []
+
+    async def run():
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        chunks = [chunk async for chunk in engine.astream_answer("What is devotion?")]
+        task.cancel()
+        return chunks
+
+    chunks = asyncio.run(run())
+
+    assert chunks == ["Serve others with love and remember the Lord in every act."]
+    assert len(ticks) > 5
+
+
+def test_stream_normalizes_indic_text_and_appends_disclaimer():
+    decomposed = unicodedata.normalize("NFD", "\u0915\u093c\u0930\u094d\u092e\u0964 ")
+    chunks = _stream(_streaming_engine([decomposed, "\u092d\u0915\u094d\u0924\u093f"]), "\u092d\u0915\u094d\u0924\u093f", "hi")
+
+    assert all(unicodedata.is_normalized("NFC", chunk) for chunk in chunks)
+    assert chunks[-1] == rag_engine.SafetyFilter.DISCLAIMER
+
+
+def test_sanitize_response_rewrites_claims_and_flags_uncertainty():
+    sanitize = rag_engine.SafetyFilter.sanitize_response
+    long_answer = "Devotion is the steady remembrance of the divine in every act of daily life."
+
+    assert sanitize(long_answer) == long_answer
+    assert sanitize("Worship me and I AM DIVINE" + long_answer).startswith("Sai Baba teaches and Sai Baba teaches")
+    assert sanitize("I don't know. " + long_answer).endswith(rag_engine.SafetyFilter.DISCLAIMER)
+    assert sanitize("Be kind.") == "Be kind." + rag_engine.SafetyFilter.DISCLAIMER
+
+
+def _reference_prohibited(question):
+    lowered = question.lower()
+    for category, keywords in (
+        ("medical", rag_engine._MEDICAL_KEYWORDS),
+        ("legal", rag_engine._LEGAL_KEYWORDS),
+        ("predictive", rag_engine._PREDICTIVE_KEYWORDS),
+    ):
+        if any(keyword in lowered for keyword in keywords):
+            return rag_engine.SafetyFilter.WARNINGS[category]
+    return None
+
+
+@pytest.mark.parametrize("question", [
+    "What is devotion?",
+    "Can prayer CURE my Diabetes?",
+    "Will my illness go away?",
+    "Should I hire a LAWYER?",
+    "When will I find peace?",
+    "Tell me the stock market trend",
+    "भक्ति क्या है?",
+    "क्या medicine लेनी चाहिए?",
+    "Who wrote the testament of faith?",
+    "sick",
+    "",
+])
+def test_safety_filter_tables_match_substring_rules(question):
+    assert rag_engine.SafetyFilter.is_prohibited_topic(question) == _reference_prohibited(question)
+    assert rag_engine.SafetyFilter.is_prohibited_topic(question, question.lower()) == _reference_prohibited(question)
+
+
+def test_concurrent_async_questions_share_one_llm_batch(monkeypatch):
+    monkeypatch.setattr(rag_engine.settings, "llm_batch_size", 4)
+    monkeypatch.setattr(rag_engine.settings, "llm_batch_wait_ms", 50)
+    engine = _offline_engine(_DocStore())
+    engine.llm = object()
+    engine._io_pool = ThreadPoolExecutor(max_workers=4)
+    batches = []
+
+    async def ainvoke_batch(prepared_list):
+        batches.append([prepared["question"] for prepared in prepared_list])
+        return {i: f"Answer to {prepared['question']} given with loving patience." for i, prepared in enumerate(prepared_list)}
+
+    engine._ainvoke_batch = ainvoke_batch
+    questions = ["What is devotion?", "What is surrender?", "What is faith?"]
+
+    async def ask_all():
+        return await asyncio.gather(*(engine.answer_question_async(q, "en") for q in questions))
+
+    results = asyncio.run(ask_all())
+    engine._io_pool.shutdown()
+
+    assert batches == [questions]
+    assert [result.answer for result in results] == [
+        f"Answer to {q} given with loving patience." for q in questions
+    ]
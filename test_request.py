@@ -1,15 +1,8 @@
-import time
-import requests
+"""Test a full question through simple_api"""
 
-# Wait a bit for the server to start
-time.sleep(3)
 
-url = "http://127.0.0.1:8000/ask"
-payload = {"question": "What is devotion according to Sai Baba?"}
-
-try:
-    r = requests.post(url, json=payload, timeout=30)
-    print(r.status_code)
-    print(r.text)
-except Exception as e:
-    print('ERROR', e)
+def test_request(simple_client):
+    payload = {"question": "What is devotion according to Sai Baba?"}
+    r = simple_client.post("/ask", json=payload)
+    assert r.status_code == 200
+    assert isinstance(r.json()["sources"], list)
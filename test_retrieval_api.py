@@ -1,14 +1,122 @@
-from fastapi.testclient import TestClient
-from retrieval_api import app
+"""Test retrieval_api endpoints"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-client = TestClient(app)
+import pytest
 
-print('Calling GET /health')
-res = client.get('/health')
-print(res.status_code)
-print(res.json())
 
-print('\nCalling POST /ask')
-res = client.post('/ask', json={'question':'What does Sai Baba teach about devotion?','language':'en'})
-print(res.status_code)
-print(res.json())
+def test_health(client):
+    res = client.get('/health')
+    assert res.status_code == 200
+
+
+def test_ask(client):
+    res = client.post('/ask', json={'question': 'What does Sai Baba teach about devotion?', 'language': 'en'})
+    assert res.status_code == 200
+    assert "answer" in res.json()
+
+
+def test_concurrent_first_requests_load_vector_store_once(monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("pypdf")
+    import retrieval_api
+
+    loads = []
+
+    class _SlowPipeline:
+        def load_vector_store(self):
+            loads.append(1)
+            time.sleep(0.05)
+            return object()
+
+    monkeypatch.setattr(retrieval_api, "_vector_store", None)
+    monkeypatch.setattr(retrieval_api, "_pipeline", _SlowPipeline())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        stores = list(pool.map(lambda _: retrieval_api.get_vector_store(), range(8)))
+
+    assert len(loads) == 1
+    assert all(store is stores[0] for store in stores)
+
+
+class _BatchStore:
+    """Vector store stand-in that records each batched search."""
+
+    def __init__(self):
+        self.batches = []
+
+    def similarity_search_batch(self, questions, k):
+        self.batches.append(list(questions))
+        return [[f"{question}#{k}"] for question in questions]
+
+
+def test_concurrent_searches_are_batched(monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("pypdf")
+    import retrieval_api
+
+    monkeypatch.setattr(retrieval_api.settings, "search_batch_size", 8)
+    monkeypatch.setattr(retrieval_api.settings, "search_batch_wait_ms", 50)
+    monkeypatch.setattr(retrieval_api, "get_query_cache", lambda: None)
+    store = _BatchStore()
+    questions = [f"q{i}" for i in range(5)]
+
+    async def search_all():
+        return await asyncio.gather(*(retrieval_api.batched_similarity_search(store, q, 3) for q in questions))
+
+    results = asyncio.run(search_all())
+
+    assert store.batches == [questions]
+    assert results == [[f"{q}#3"] for q in questions]
+
+
+def test_identical_inflight_questions_share_one_answer(monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("pypdf")
+    import retrieval_api
+
+    computed = []
+
+    async def compute_answer(q, language):
+        computed.append((q, language))
+        await asyncio.sleep(0.05)
+        return retrieval_api.AnswerResponse(answer=f"About {q}", language=language or "en", sources=[])
+
+    monkeypatch.setattr(retrieval_api, "compute_answer", compute_answer)
+    request = retrieval_api.QuestionRequest(question="  What is devotion? ", language="en")
+
+    async def ask_all():
+        return await asyncio.gather(
+            *(retrieval_api.ask(request) for _ in range(3)),
+            retrieval_api.ask(retrieval_api.QuestionRequest(question="What is devotion?", language="hi")),
+        )
+
+    answers = asyncio.run(ask_all())
+
+    assert computed == [("What is devotion?", "en"), ("What is devotion?", "hi")]
+    assert answers[0] is answers[1] is answers[2]
+    assert answers[3].language == "hi"
+    assert retrieval_api._inflight == {}
+
+
+def test_concurrent_first_requests_open_query_cache_once(monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("pypdf")
+    import retrieval_api
+
+    opened = []
+
+    def open_query_cache(path, model_name):
+        opened.append(path)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(retrieval_api, "_query_cache", None)
+    monkeypatch.setattr(retrieval_api, "_query_cache_opened", False)
+    monkeypatch.setattr(retrieval_api, "_pipeline", type("_Pipeline", (), {"model_name": "model-a"})())
+    monkeypatch.setattr(retrieval_api, "open_query_cache", open_query_cache)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        caches = list(pool.map(lambda _: retrieval_api.get_query_cache(), range(8)))
+
+    assert len(opened) == 1
+    assert all(cache is caches[0] for cache in caches)
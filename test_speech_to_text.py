@@ -0,0 +1,137 @@
+"""Behaviour tests for speech_to_text helpers"""
+import pytest
+
+
+def test_quantize_linear_layers_swaps_every_whisper_linear():
+    torch = pytest.importorskip("torch")
+    whisper = pytest.importorskip("whisper")
+    pytest.importorskip("pydub")
+    from whisper.model import ModelDimensions, Whisper
+
+    from speech_to_text import _quantize_linear_layers
+
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1,
+    )
+    model = Whisper(dims)
+    linear_layers = sum(isinstance(m, torch.nn.Linear) for m in model.modules())
+
+    model, quantized = _quantize_linear_layers(model)
+
+    assert quantized == linear_layers > 0
+    assert not any(isinstance(m, whisper.model.Linear) for m in model.modules())
+    assert sum(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in model.modules()) == quantized
+
+
+def _folder_converter(monkeypatch, detected):
+    """A converter with the model-facing methods replaced by recorders."""
+    pytest.importorskip("pydub")
+    import speech_to_text
+
+    converter = object.__new__(speech_to_text.MultilingualSpeechToTextConverter)
+    converter.workers = 1
+    monkeypatch.setattr(converter, "detect_language", lambda path, prepared=None: detected.append(path) or "en")
+    monkeypatch.setattr(converter, "load_audio", lambda path, for_detection=True: None)
+    monkeypatch.setattr(
+        converter, "_process_into_folder",
+        lambda path, folder, auto_detect, prepared=None, language=None: {"file": path, "language": language or "auto"},
+    )
+    return converter
+
+
+def test_process_audio_folder_defaults_to_per_file_detection(monkeypatch, tmp_path):
+    for i in range(5):
+        (tmp_path / f"clip{i}.wav").write_bytes(b"")
+    detected = []
+    converter = _folder_converter(monkeypatch, detected)
+
+    results = converter.process_audio_folder(str(tmp_path), str(tmp_path / "out"))
+
+    # No folder-level sampling pass: every file is left to detect its own language
+    assert detected == []
+    assert [info["language"] for info in results] == ["auto"] * 5
+
+
+def test_process_audio_folder_sample_strategy_fixes_folder_language(monkeypatch, tmp_path):
+    for i in range(9):
+        (tmp_path / f"clip{i}.wav").write_bytes(b"")
+    detected = []
+    converter = _folder_converter(monkeypatch, detected)
+
+    results = converter.process_audio_folder(str(tmp_path), str(tmp_path / "out"), detection_strategy="sample")
+
+    assert len(detected) == 3
+    assert [info["language"] for info in results] == ["en"] * 9
+
+
+def test_faster_whisper_detection_sees_only_first_30_seconds(monkeypatch):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("pydub")
+    import speech_to_text
+
+    seen = []
+
+    class _Model:
+        def detect_language(self, audio):
+            seen.append(len(audio))
+            return "te", 0.9, [("te", 0.9)]
+
+    converter = object.__new__(speech_to_text.MultilingualSpeechToTextConverter)
+    converter.backend = "faster_whisper"
+    converter.model = _Model()
+    converter.supported_languages = ["en", "hi", "te", "kn"]
+    ten_minutes = {"audio": np.zeros(600 * speech_to_text.SAMPLE_RATE, dtype=np.float32)}
+
+    assert converter.detect_language("talk.wav", ten_minutes) == "te"
+    assert seen == [30 * speech_to_text.SAMPLE_RATE]
+
+
+def _transcribing_converter(monkeypatch, text="Om Sai Ram"):
+    pytest.importorskip("pydub")
+    import speech_to_text
+
+    converter = object.__new__(speech_to_text.MultilingualSpeechToTextConverter)
+    converter._made_dirs = set()
+    monkeypatch.setattr(
+        converter, "transcribe_audio",
+        lambda path, language=None, auto_detect=True, prepared=None: {"text": text, "language": "en"},
+    )
+    monkeypatch.setattr(converter, "clean_transcript", lambda text, language: text)
+    return converter
+
+
+def test_process_audio_file_writes_transcript_without_leftovers(monkeypatch, tmp_path):
+    converter = _transcribing_converter(monkeypatch)
+    target = tmp_path / "talk.txt"
+
+    converter.process_audio_file("talk.mp3", str(target))
+
+    assert target.read_text(encoding="utf-8") == "Om Sai Ram"
+    assert [p.name for p in tmp_path.iterdir()] == ["talk.txt"]
+
+
+def test_process_audio_file_removes_temp_file_on_failure(monkeypatch, tmp_path):
+    import os
+
+    converter = _transcribing_converter(monkeypatch)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        converter.process_audio_file("talk.mp3", str(tmp_path / "talk.txt"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_same_stem_transcripts_written_concurrently(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    converter = _transcribing_converter(monkeypatch, text="x" * 200_000)
+    target = str(tmp_path / "a.txt")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda path: converter.process_audio_file(path, target), ["a.mp3", "a.wav"] * 4))
+
+    assert (tmp_path / "a.txt").read_text(encoding="utf-8") == "x" * 200_000
+    assert [p.name for p in tmp_path.iterdir()] == ["a.txt"]
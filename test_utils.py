@@ -0,0 +1,96 @@
+"""Behaviour tests for utils helpers"""
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import utils
+from utils import PerformanceTimer, count_words, get_file_extension, sanitize_filename, sanitize_filenames
+
+
+def _reference_sanitize(filename):
+    sanitized = re.sub(r'[<>:"/\\|?*]', '', filename)
+    sanitized = sanitized.replace(' ', '_')
+    sanitized = re.sub(r'_+', '_', sanitized)
+    return sanitized.strip('_')
+
+
+@pytest.mark.parametrize("text", [
+    "", "one", "  leading and trailing  ", "abcd efgh", "abc defgh ij", "ab\ncd\tef  gh",
+    "a" * 13, "word " * 7, " x" * 9, "abcdefgh", "abc d efg h",
+])
+def test_count_words_chunk_boundaries(monkeypatch, text):
+    monkeypatch.setattr(utils, "_WORD_COUNT_CHUNK", 4)
+    assert count_words(text) == len(text.split())
+
+
+def test_validate_file_path_remembers_missing_paths(monkeypatch, tmp_path):
+    monkeypatch.setattr(utils, "_missing_paths", set())
+    monkeypatch.setattr(utils, "_missing_paths_since", time.monotonic())
+    path = str(tmp_path / "late.txt")
+
+    assert not utils.validate_file_path(path, must_exist=True, remember_missing=True)
+    Path(path).write_text("now here")
+    # Served from the negative cache until it expires; plain calls still stat
+    assert not utils.validate_file_path(path, must_exist=True, remember_missing=True)
+    assert utils.validate_file_path(path, must_exist=True)
+
+    monkeypatch.setattr(utils, "_missing_paths_since", time.monotonic() - utils._MISSING_PATHS_TTL - 1)
+    assert utils.validate_file_path(path, must_exist=True, remember_missing=True)
+    assert not utils.validate_file_path(str(tmp_path), must_exist=True, remember_missing=True)
+
+
+def test_performance_timer_stats_over_ring_buffer(monkeypatch):
+    monkeypatch.setattr(PerformanceTimer, "_durations", np.zeros(4))
+    monkeypatch.setattr(PerformanceTimer, "_recorded", 0)
+    monkeypatch.setattr(PerformanceTimer, "buffered", True)
+    monkeypatch.setattr(PerformanceTimer, "_log_buffer", PerformanceTimer._log_buffer.__class__(maxlen=10))
+    assert PerformanceTimer.stats() == {"count": 0}
+
+    for _ in range(6):
+        with PerformanceTimer("tick"):
+            pass
+    stats = PerformanceTimer.stats()
+    assert stats["count"] == 4
+    assert 0 <= stats["p50"] <= stats["p95"] <= stats["p99"]
+
+    PerformanceTimer._durations[:] = [1.0, 2.0, 3.0, 4.0]
+    stats = PerformanceTimer.stats()
+    assert stats["mean"] == 2.5
+    assert stats["p50"] == 2.5
+
+
+NAMES = [
+    "my file.txt", "a<b>c:d\"e/f\\g|h?i*j.pdf", "  spaced  out  ", "__x__y__", "_ _ _", "",
+    "ಧರ್ಮ ಗ್ರಂಥ.mp3", "plain",
+]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_sanitize_filename_matches_regex_rules(name):
+    assert sanitize_filename(name) == _reference_sanitize(name)
+
+
+def test_sanitize_filenames_keeps_order():
+    assert sanitize_filenames(NAMES) == [_reference_sanitize(name) for name in NAMES]
+
+
+@pytest.mark.parametrize("path", [
+    "a/b/file.TXT", "archive.tar.gz", ".bashrc", "dir.d/file", "file.", "a/b/", "..", ".tar.gz",
+    "/abs/path/Song.MP3", "noext", "",
+])
+def test_get_file_extension_matches_path_suffix(path):
+    assert get_file_extension(path) == Path(path).suffix.lower().lstrip('.')
+
+
+def test_get_file_extension_honours_backslashes():
+    assert get_file_extension("C:\\audio\\talk.WAV") == "wav"
+    assert get_file_extension("C:\\audio.d\\talk") == ""
+
+
+def test_validate_file_path_cannot_be_bypassed(tmp_path):
+    with pytest.raises(TypeError):
+        utils.validate_file_path(str(tmp_path / "missing.txt"), must_exist=True, _trusted=True)
+    assert not utils.validate_file_path(str(tmp_path / "missing.txt"), must_exist=True)
@@ -4,27 +4,70 @@ Utility functions and helpers for the Sai Baba Guidance Chatbot.
 
 import os
 import re
-from pathlib import Path
-from typing import List, Dict, Any
+import stat
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from typing import List, Dict, Any, Deque, Iterator, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
 
-def validate_file_path(file_path: str, must_exist: bool = False) -> bool:
+
+# sanitize_filename: invalid characters dropped, spaces become underscores
+_FILENAME_TABLE = str.maketrans({**dict.fromkeys('<>:"/\\|?*'), ' ': '_'})
+_MULTI_UNDERSCORE_RE = re.compile(r'__+')
+
+# validate_file_path(remember_missing=True): paths found missing, forgotten
+# all at once every _MISSING_PATHS_TTL seconds (or when the set fills up)
+_MISSING_PATHS_TTL = 60.0
+_MISSING_PATHS_MAX = 1 << 17
+_missing_paths: set = set()
+_missing_paths_since = time.monotonic()
+
+# Path separators on this platform
+_SEPARATORS = os.sep + (os.altsep or '')
+
+# count_words: characters split at a time
+_WORD_COUNT_CHUNK = 1 << 20
+
+
+def validate_file_path(
+    file_path: str,
+    must_exist: bool = False,
+    remember_missing: bool = False
+) -> bool:
     """
     Validate a file path.
     
     Args:
         file_path: Path to validate
         must_exist: If True, file must exist
+        remember_missing: With must_exist, answer False without a stat() for
+            paths found missing during the last minute; a file created in
+            that window may still be reported missing
     
     Returns:
         True if valid, False otherwise
     """
+    if not must_exist:
+        # Anything Path() would accept
+        return isinstance(file_path, (str, os.PathLike))
+    if remember_missing:
+        global _missing_paths_since
+        now = time.monotonic()
+        if now - _missing_paths_since > _MISSING_PATHS_TTL or len(_missing_paths) >= _MISSING_PATHS_MAX:
+            _missing_paths.clear()
+            _missing_paths_since = now
+        if file_path in _missing_paths:
+            return False
     try:
-        path = Path(file_path)
-        if must_exist:
-            return path.exists() and path.is_file()
-        return True
+        return stat.S_ISREG(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        if remember_missing:
+            _missing_paths.add(file_path)
+        return False
     except Exception:
         return False
 
@@ -41,13 +84,11 @@ def validate_directory(dir_path: str, create: bool = False) -> bool:
         True if valid/created, False otherwise
     """
     try:
-        path = Path(dir_path)
-        if not path.exists():
-            if create:
-                path.mkdir(parents=True, exist_ok=True)
-                return True
-            return False
-        return path.is_dir()
+        if create:
+            # Raises FileExistsError if a non-directory is in the way
+            os.makedirs(dir_path, exist_ok=True)
+            return True
+        return stat.S_ISDIR(os.stat(dir_path).st_mode)
     except Exception:
         return False
 
@@ -62,29 +103,86 @@ def get_file_extension(file_path: str) -> str:
     Returns:
         File extension (lowercase, without dot)
     """
-    return Path(file_path).suffix.lower().lstrip('.')
+    # Same rule as Path.suffix (a leading dot is not an extension), as plain
+    # string operations; both separators are honoured on every platform
+    name = file_path.rstrip('/\\').rpartition('/')[2].rpartition('\\')[2]
+    dot = name.rfind('.')
+    return '' if dot <= 0 else name[dot + 1:].lower()
 
 
-def list_files_by_extension(directory: str, extensions: List[str]) -> List[str]:
+def iter_entries_by_extension(
+    directory: str, extensions: List[str], include_dirs: bool = False
+) -> Iterator[os.DirEntry]:
+    """
+    Yield the os.DirEntry of each match in a directory tree, as it is found.
+    
+    Walks the tree once with os.scandir, whatever the number of extensions;
+    matching is case-insensitive. Entries carry the scan's cached metadata,
+    see extract_metadata_from_entry.
+    
+    Args:
+        directory: Directory to search
+        extensions: List of extensions (without dots)
+        include_dirs: Also yield directories whose names carry one of the
+            extensions
+    
+    Yields:
+        Directory entries
+    """
+    if not os.path.isdir(directory):
+        return
+    
+    exts = {ext.lower().lstrip('.') for ext in extensions}
+    pending = [directory]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type, so this costs no stat()
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir:
+                        pending.append(entry.path)
+                        if not include_dirs:
+                            continue
+                    _, dot, ext = entry.name.rpartition('.')
+                    if dot and ext.lower() in exts:
+                        yield entry
+        except OSError:
+            # Unreadable directories are skipped, as glob does
+            continue
+
+
+def iter_files_by_extension(directory: str, extensions: List[str], include_dirs: bool = False) -> Iterator[str]:
+    """
+    Yield files in a directory tree with specific extensions, as they are found.
+    
+    Args:
+        directory: Directory to search
+        extensions: List of extensions (without dots)
+        include_dirs: Also yield directories whose names carry one of the
+            extensions
+    
+    Yields:
+        File paths
+    """
+    for entry in iter_entries_by_extension(directory, extensions, include_dirs):
+        yield entry.path
+
+
+def list_files_by_extension(directory: str, extensions: List[str], include_dirs: bool = False) -> List[str]:
     """
     List all files in directory with specific extensions.
     
     Args:
         directory: Directory to search
         extensions: List of extensions (without dots)
+        include_dirs: Also list directories whose names carry one of the
+            extensions
     
     Returns:
         List of file paths
     """
-    dir_path = Path(directory)
-    if not dir_path.exists():
-        return []
-    
-    files = []
-    for ext in extensions:
-        files.extend(dir_path.glob(f"**/*.{ext}"))
-    
-    return [str(f) for f in files]
+    return list(iter_files_by_extension(directory, extensions, include_dirs))
 
 
 def sanitize_filename(filename: str) -> str:
@@ -97,15 +195,27 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove invalid characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', filename)
-    # Replace spaces with underscores
-    sanitized = sanitized.replace(' ', '_')
+    # Remove invalid characters and replace spaces with underscores in one pass
+    sanitized = filename.translate(_FILENAME_TABLE)
     # Remove multiple underscores
-    sanitized = re.sub(r'_+', '_', sanitized)
+    if '__' in sanitized:
+        sanitized = _MULTI_UNDERSCORE_RE.sub('_', sanitized)
     return sanitized.strip('_')
 
 
+def sanitize_filenames(filenames: List[str]) -> List[str]:
+    """
+    Sanitize many filenames at once.
+    
+    Args:
+        filenames: Original filenames
+    
+    Returns:
+        Sanitized filenames, in order (same rules as sanitize_filename)
+    """
+    return [sanitize_filename(name) for name in filenames]
+
+
 def format_timestamp(dt: datetime = None) -> str:
     """
     Format timestamp for logging.
@@ -118,7 +228,11 @@ def format_timestamp(dt: datetime = None) -> str:
     """
     if dt is None:
         dt = datetime.now()
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat writes the fields directly instead of going through libc
+    # strftime; the offset an aware datetime would add is left out, as before
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None)
+    return dt.isoformat(sep=' ', timespec='seconds')
 
 
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
@@ -138,26 +252,91 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)] + suffix
 
 
-def extract_metadata_from_document(doc_path: str) -> Dict[str, Any]:
+def truncate_texts(texts: List[str], max_length: int = 100, suffix: str = "...") -> List[str]:
+    """
+    Truncate many texts to a maximum length.
+    
+    Args:
+        texts: Texts to truncate
+        max_length: Maximum length
+        suffix: Suffix to add if truncated
+    
+    Returns:
+        Truncated texts, in order
+    """
+    # Cut point worked out once for the whole batch
+    cut = max_length - len(suffix)
+    return [text if len(text) <= max_length else text[:cut] + suffix for text in texts]
+
+
+@lru_cache(maxsize=4096)
+def _stat_document(doc_path: str) -> Tuple[int, Optional[float]]:
+    """Size and mtime of a document from one stat(); (0, None) if unreadable."""
+    try:
+        st = os.stat(doc_path)
+        return st.st_size, st.st_mtime
+    except OSError:
+        return 0, None
+
+
+def extract_metadata_from_document(doc_path: str, cached: bool = False, _trusted: bool = False) -> Dict[str, Any]:
     """
     Extract metadata from document path.
     
     Args:
         doc_path: Path to document
+        cached: Reuse the size and modified time from an earlier cached call
+            for the same path (no stat()); only for files known not to change
+            meanwhile. `_stat_document.cache_clear()` drops the cache.
+        _trusted: The path comes from our own directory scan, so it is
+            already normalized
     
     Returns:
         Dictionary with metadata
     """
-    path = Path(doc_path)
+    # String operations rather than parsing a Path, with Path's rules: trailing
+    # separators are ignored and a leading or trailing dot is no extension
+    filename = os.path.basename(doc_path if _trusted else os.fspath(doc_path).rstrip(_SEPARATORS))
+    dot = filename.rfind('.')
+    extension = filename[dot:].lower() if 0 < dot < len(filename) - 1 else ''
+    size, mtime = _stat_document(doc_path) if cached else _stat_document.__wrapped__(doc_path)
     metadata = {
-        "filename": path.name,
-        "extension": path.suffix.lower(),
-        "size_bytes": path.stat().st_size if path.exists() else 0,
-        "modified_time": datetime.fromtimestamp(path.stat().st_mtime).isoformat() if path.exists() else None
+        "filename": filename,
+        "extension": extension,
+        "size_bytes": size,
+        "modified_time": datetime.fromtimestamp(mtime).isoformat() if mtime is not None else None
     }
     return metadata
 
 
+def extract_metadata_from_entry(entry: os.DirEntry) -> Dict[str, Any]:
+    """
+    Extract document metadata from a directory scan entry.
+    
+    Same result as extract_metadata_from_document, but the name comes from the
+    entry and the stat result is the entry's own: cached after first use, and
+    already filled in by the scan on Windows.
+    
+    Args:
+        entry: Entry from os.scandir (e.g. iter_entries_by_extension)
+    
+    Returns:
+        Dictionary with metadata
+    """
+    try:
+        st = entry.stat()
+        size, mtime = st.st_size, st.st_mtime
+    except OSError:
+        size, mtime = 0, None
+    dot = entry.name.rfind('.')
+    return {
+        "filename": entry.name,
+        "extension": entry.name[dot:].lower() if 0 < dot < len(entry.name) - 1 else '',
+        "size_bytes": size,
+        "modified_time": datetime.fromtimestamp(mtime).isoformat() if mtime is not None else None
+    }
+
+
 def count_words(text: str) -> int:
     """
     Count words in text.
@@ -168,7 +347,17 @@ def count_words(text: str) -> int:
     Returns:
         Word count
     """
-    return len(text.split())
+    if len(text) <= _WORD_COUNT_CHUNK:
+        return len(text.split())
+    # Split long texts a slice at a time so only one slice's words are ever
+    # materialized; a word cut by a slice boundary is counted twice, once on
+    # each side, so those are subtracted again
+    count = 0
+    for start in range(0, len(text), _WORD_COUNT_CHUNK):
+        count += len(text[start:start + _WORD_COUNT_CHUNK].split())
+        if start and not text[start - 1].isspace() and not text[start].isspace():
+            count -= 1
+    return count
 
 
 def estimate_tokens(text: str, chars_per_token: int = 4) -> int:
@@ -185,27 +374,100 @@ def estimate_tokens(text: str, chars_per_token: int = 4) -> int:
     return len(text) // chars_per_token
 
 
+def estimate_tokens_batch(texts: List[str], chars_per_token: int = 4) -> np.ndarray:
+    """
+    Estimate token counts for many texts in one vectorized division.
+    
+    Args:
+        texts: Texts to estimate
+        chars_per_token: Average characters per token
+    
+    Returns:
+        int64 array of estimated token counts, aligned with texts
+    """
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    return lengths // chars_per_token
+
+
 class PerformanceTimer:
-    """Context manager for timing operations."""
+    """
+    Context manager for timing operations.
+    
+    Each block prints its duration on exit. With `PerformanceTimer.buffered`
+    set, the results are queued instead (the newest 10,000 are kept) and written
+    together by `PerformanceTimer.flush()`, so timing tight loops does not
+    pay for a write to stdout per block.
+    
+    Every duration is also recorded in a shared ring buffer of the last
+    65,536 blocks; `PerformanceTimer.stats()` summarizes it.
+    """
+    
+    # No per-instance __dict__; a timer is created for every timed block
+    __slots__ = ("operation_name", "start_ns", "end_ns")
+    
+    buffered = False
+    _log_buffer: Deque[Tuple[str, float]] = deque(maxlen=10_000)
+    # Size is a power of two so the slot is a bit mask of the counter
+    _durations = np.zeros(1 << 16, dtype=np.float64)
+    _recorded = 0
     
     def __init__(self, operation_name: str = "Operation"):
         self.operation_name = operation_name
-        self.start_time = None
-        self.end_time = None
+        # Monotonic perf_counter readings in nanoseconds: cheap to take and
+        # unaffected by wall-clock (NTP) adjustments
+        self.start_ns = None
+        self.end_ns = None
     
     def __enter__(self):
-        self.start_time = datetime.now()
+        self.start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.end_time = datetime.now()
-        duration = (self.end_time - self.start_time).total_seconds()
-        print(f"{self.operation_name} completed in {duration:.2f} seconds")
+        self.end_ns = time.perf_counter_ns()
+        PerformanceTimer._durations[PerformanceTimer._recorded & (PerformanceTimer._durations.size - 1)] = self.duration
+        PerformanceTimer._recorded += 1
+        if type(self).buffered:
+            # Formatted at flush time, off the timed path
+            type(self)._log_buffer.append((self.operation_name, self.duration))
+        else:
+            print(f"{self.operation_name} completed in {self.duration:.2f} seconds")
         return False
     
+    @staticmethod
+    def stats() -> Dict[str, float]:
+        """
+        Summarize the recorded durations.
+        
+        Returns:
+            Dictionary with 'count', 'mean', 'p50', 'p95' and 'p99' (seconds)
+            over the retained blocks; only 'count' when nothing was timed
+        """
+        samples = PerformanceTimer._durations[:min(PerformanceTimer._recorded, PerformanceTimer._durations.size)]
+        if samples.size == 0:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {
+            "count": int(samples.size),
+            "mean": float(samples.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+    
+    @classmethod
+    def flush(cls) -> None:
+        """Write all queued timing lines to stdout in one call."""
+        lines = []
+        while cls._log_buffer:
+            operation_name, duration = cls._log_buffer.popleft()
+            lines.append(f"{operation_name} completed in {duration:.2f} seconds")
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+    
     @property
     def duration(self) -> float:
         """Get duration in seconds."""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self.start_ns is not None and self.end_ns is not None:
+            return (self.end_ns - self.start_ns) / 1e9
         return 0.0